@@ -0,0 +1,183 @@
+# bulk_onboard.py
+# Onboard many netids at once: scrape in parallel, write to MongoDB in batches.
+#
+# Usage:
+#   python backend/bulk_onboard.py netids.txt --semesters "Spring 2025,Fall 2025" --workers 4
+#
+# Each netid is scraped on a bounded thread pool (one pooled Chrome per
+# worker) with retries and exponential backoff. Results are written with
+# bulk_write every --batch-size users, and a netid is only recorded in the
+# checkpoint file after its write lands, so re-running the same command after
+# a crash resumes where it left off.
+
+import argparse
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from pymongo import UpdateOne
+
+from init_user import scrape_user, new_user_document, semesters as DEFAULT_SEMESTERS
+from db import users, ensure_indexes
+from scrapers.academic_calendar import refresh_academic_calendar_if_stale
+from scrapers.driver_pool import DriverPool
+from scrapers.timing import timings
+
+
+def read_netids(path):
+    """Reads one netid per line, ignoring blanks, '#' comments and duplicates."""
+    netids = []
+    with open(path) as f:
+        for line in f:
+            netid = line.split("#", 1)[0].strip()
+            if netid and netid not in netids:
+                netids.append(netid)
+    return netids
+
+
+class Checkpoint:
+    """Set of finished netids persisted to a JSON file (written atomically)."""
+
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        self._lock = threading.Lock()
+        if os.path.exists(path):
+            with open(path) as f:
+                self.done = set(json.load(f).get("done", []))
+
+    def mark_done(self, netids):
+        with self._lock:
+            self.done.update(netids)
+            tmp = f"{self.path}.tmp"
+            with open(tmp, "w") as f:
+                json.dump({"done": sorted(self.done)}, f, indent=2)
+            os.replace(tmp, self.path)
+
+
+def onboard_op(user_profile, events, fingerprints=None):
+    """Upsert that creates the user if needed and sets their current schedule."""
+    netid = user_profile["netid"]
+    doc = new_user_document(netid)
+    update = {"$setOnInsert": doc}
+    fields = dict(fingerprints or {})
+    if events is not None:
+        del doc["current_schedule"]
+        fields["current_schedule"] = events
+    if fields:
+        update["$set"] = fields
+    return UpdateOne({"netid": netid}, update, upsert=True)
+
+
+def scrape_with_retry(netid, semesters, pool, retries=3, backoff=2.0):
+    """
+    Scrapes one user, retrying with exponential backoff (plus jitter).
+
+    Returns:
+        (user_profile, events, fingerprints)
+
+    Raises:
+        RuntimeError: If every attempt failed.
+    """
+    for attempt in range(retries + 1):
+        try:
+            user_profile, events, fingerprints = scrape_user(netid, semesters, pool=pool)
+            if user_profile:
+                return user_profile, events, fingerprints
+            error = "profile scrape failed"
+        except Exception as e:
+            error = str(e)
+        if attempt < retries:
+            delay = backoff * (2 ** attempt) * (1 + random.random() / 2)
+            print(f"[bulk] {netid}: attempt {attempt + 1} failed ({error}); retrying in {delay:.1f}s")
+            time.sleep(delay)
+    raise RuntimeError(f"{netid}: giving up after {retries + 1} attempts ({error})")
+
+
+def bulk_onboard(netids, semesters, workers=2, retries=3, backoff=2.0,
+                 batch_size=50, checkpoint_path="./.users/onboard_checkpoint.json"):
+    """
+    Onboards every netid not already in the checkpoint.
+
+    Returns:
+        dict: {"onboarded": [...], "failed": {netid: error}, "skipped": [...]}
+    """
+    os.makedirs(os.path.dirname(checkpoint_path) or ".", exist_ok=True)
+    checkpoint = Checkpoint(checkpoint_path)
+    pending = [n for n in netids if n not in checkpoint.done]
+    skipped = [n for n in netids if n in checkpoint.done]
+    print(f"[bulk] {len(pending)} to onboard, {len(skipped)} already done")
+
+    pool = DriverPool(size=workers)
+    batch = []  # (netid, UpdateOne)
+    onboarded, failed = [], {}
+
+    def flush():
+        if not batch:
+            return
+        users.bulk_write([op for _, op in batch], ordered=False)
+        finished = [netid for netid, _ in batch]
+        checkpoint.mark_done(finished)
+        onboarded.extend(finished)
+        print(f"[MongoDB] Saved {len(finished)} user(s)")
+        batch.clear()
+
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(scrape_with_retry, netid, semesters, pool, retries, backoff): netid
+                for netid in pending
+            }
+            for future in as_completed(futures):
+                netid = futures[future]
+                try:
+                    user_profile, events, fingerprints = future.result()
+                except Exception as e:
+                    failed[netid] = str(e)
+                    print(f"[bulk] {e}")
+                    continue
+                batch.append((netid, onboard_op(user_profile, events, fingerprints)))
+                if len(batch) >= batch_size:
+                    flush()
+        flush()
+    finally:
+        pool.close()
+
+    return {"onboarded": onboarded, "failed": failed, "skipped": skipped}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Onboard many RUPlanner users from a file of netids.")
+    parser.add_argument("netids_file", help="File with one netid per line")
+    parser.add_argument("--semesters", default=",".join(DEFAULT_SEMESTERS),
+                        help="Comma-separated semesters, e.g. 'Spring 2025,Fall 2025'")
+    parser.add_argument("--workers", type=int, default=2, help="Parallel browsers")
+    parser.add_argument("--retries", type=int, default=3)
+    parser.add_argument("--backoff", type=float, default=2.0, help="Initial retry delay in seconds")
+    parser.add_argument("--batch-size", type=int, default=50, help="Users per bulk_write")
+    parser.add_argument("--checkpoint", default="./.users/onboard_checkpoint.json")
+    args = parser.parse_args()
+
+    ensure_indexes(log=True)
+    refresh_academic_calendar_if_stale(log=True)  # once, before any schedule conversion
+    result = bulk_onboard(
+        read_netids(args.netids_file),
+        [s.strip() for s in args.semesters.split(",") if s.strip()],
+        workers=args.workers,
+        retries=args.retries,
+        backoff=args.backoff,
+        batch_size=args.batch_size,
+        checkpoint_path=args.checkpoint
+    )
+
+    print(f"\n✅ Onboarded {len(result['onboarded'])}, skipped {len(result['skipped'])}, "
+          f"failed {len(result['failed'])}")
+    for netid, error in result["failed"].items():
+        print(f"   ⚠️ {error}")
+    timings.report()
+
+
+if __name__ == "__main__":
+    main()
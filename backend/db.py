@@ -0,0 +1,212 @@
+# db.py
+# Shared MongoDB access: one lazily created, pooled client per process.
+#
+# Every backend module imports its collection handles from here instead of
+# building its own MongoClient, so a worker opens a single connection pool
+# (sized by MONGO_MAX_POOL_SIZE) and nothing touches the network at import
+# time. Under a pre-forking server (gunicorn) each worker creates its own
+# client on first use after the fork.
+
+import os
+import threading
+import time
+import certifi
+from dotenv import load_dotenv
+from pymongo import MongoClient, IndexModel, ASCENDING
+from pymongo.server_api import ServerApi
+
+load_dotenv()
+
+username = "sanikadeshmukh135"
+password = "Snehnil16"
+DEFAULT_URI = 'mongodb+srv://' + username + ':' + password + '@' + 'cluster1.jo3fsmz.mongodb.net/?retryWrites=true&w=majority'
+
+MONGO_URI = os.getenv("MONGO_URI") or DEFAULT_URI
+DB_NAME = os.getenv("MONGO_DB", "authndb")
+
+# Pool and timeout settings (milliseconds)
+POOL_OPTIONS = {
+    "maxPoolSize": int(os.getenv("MONGO_MAX_POOL_SIZE", "10")),
+    "minPoolSize": int(os.getenv("MONGO_MIN_POOL_SIZE", "0")),
+    "maxIdleTimeMS": int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000")),
+    "connectTimeoutMS": int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000")),
+    "serverSelectionTimeoutMS": int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000")),
+    "socketTimeoutMS": int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "20000")),
+}
+
+_client = None
+_client_pid = None
+_lock = threading.Lock()
+
+
+def get_client():
+    """Returns this process's MongoClient, creating it on first use."""
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        with _lock:
+            if _client is None or _client_pid != os.getpid():
+                tls_options = {}
+                if MONGO_URI.startswith("mongodb+srv://"):
+                    tls_options = {"tls": True, "tlsCAFile": certifi.where()}
+                _client = MongoClient(MONGO_URI, server_api=ServerApi('1'), **tls_options, **POOL_OPTIONS)
+                _client_pid = os.getpid()
+    return _client
+
+
+def get_db():
+    return get_client()[DB_NAME]
+
+
+def get_collection(name):
+    return get_db()[name]
+
+
+class LazyCollection:
+    """
+    Collection handle that resolves against the shared client on each use,
+    so it can be imported at module level without connecting.
+    """
+
+    def __init__(self, name):
+        self.name = name
+
+    def __getattr__(self, attr):
+        return getattr(get_collection(self.name), attr)
+
+
+users = LazyCollection("users")
+
+
+# Indexes every collection should have; netid is the filter on every hot path
+INDEXES = {
+    "users": [
+        IndexModel([("netid", ASCENDING)], unique=True, name="netid_unique"),
+    ],
+    "llm_cache": [
+        IndexModel([("key", ASCENDING)], unique=True, name="key_unique"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+    "llm_jobs": [
+        IndexModel([("job_id", ASCENDING)], unique=True, name="job_id_unique"),
+        IndexModel([("expires_at", ASCENDING)], expireAfterSeconds=0, name="expires_at_ttl"),
+    ],
+}
+
+# Seconds to wait after a failed index build (or a lookup that found netid
+# not unique) before asking the server again
+INDEX_RETRY_SECONDS = float(os.getenv("INDEX_RETRY_SECONDS", "300"))
+
+_indexes_ensured = False
+_indexes_failed_at = None
+_indexes_lock = threading.Lock()
+_netid_unique = False
+_netid_checked_at = None
+
+
+def ensure_indexes(log=False):
+    """
+    Creates any missing indexes from INDEXES. Safe to call repeatedly;
+    existing indexes are left untouched.
+
+    Raises:
+        pymongo.errors.OperationFailure: If an index cannot be built, e.g.
+            the unique netid index while duplicate netids exist.
+    """
+    global _indexes_ensured
+    for name, models in INDEXES.items():
+        created = get_collection(name).create_indexes(models)
+        if log: print(f"[MongoDB] Ensured indexes on {name}: {', '.join(created)}")
+    _indexes_ensured = True
+
+
+# ⏱️ Whether a failure or negative answer recorded at `at` is older than the retry interval
+def _retry_due(at):
+    return at is None or time.monotonic() - at >= INDEX_RETRY_SECONDS
+
+
+def ensure_indexes_once(log=False):
+    """
+    Runs ensure_indexes until it succeeds once in this process. A failure
+    is reported instead of raised, so one bad index build does not fail
+    every request, and the build is not tried again until
+    INDEX_RETRY_SECONDS have passed.
+    """
+    global _indexes_failed_at
+    if _indexes_ensured or not _retry_due(_indexes_failed_at):
+        return
+    with _indexes_lock:
+        if _indexes_ensured or not _retry_due(_indexes_failed_at):
+            return
+        try:
+            ensure_indexes(log=log)
+            _indexes_failed_at = None
+        except Exception as e:
+            _indexes_failed_at = time.monotonic()
+            print(f"[MongoDB] Index bootstrap failed, retrying in {INDEX_RETRY_SECONDS:g}s: {e}")
+
+
+def has_unique_netid_index():
+    """
+    Whether users.netid is known to be unique, so an insert can rely on
+    DuplicateKeyError instead of checking for an existing user first.
+    Until ensure_indexes has succeeded, the server's index list is asked;
+    a yes is remembered for good, a no for INDEX_RETRY_SECONDS.
+    """
+    global _netid_unique, _netid_checked_at
+    if _indexes_ensured or _netid_unique:
+        return True
+    if not _retry_due(_netid_checked_at):
+        return False
+    try:
+        info = get_collection("users").index_information()
+    except Exception:
+        info = {}
+    _netid_unique = any(index.get("unique") and index["key"] == [("netid", ASCENDING)] for index in info.values())
+    _netid_checked_at = time.monotonic()
+    return _netid_unique
+
+
+def index_usage():
+    """
+    Reports how often each index has been used since the server last
+    restarted, from $indexStats.
+
+    Returns:
+        dict: collection -> {index name -> {"ops": int, "since": datetime}}
+    """
+    usage = {}
+    for name in INDEXES:
+        stats = get_collection(name).aggregate([{"$indexStats": {}}])
+        usage[name] = {
+            s["name"]: {"ops": s["accesses"]["ops"], "since": s["accesses"]["since"]}
+            for s in stats
+        }
+    return usage
+
+
+def ping(log=False):
+    """Checks that the deployment is reachable; returns True on success."""
+    try:
+        get_client().admin.command('ping')
+        if log: print("Pinged your deployment. You successfully connected to MongoDB!")
+        return True
+    except Exception as e:
+        if log: print(e)
+        return False
+
+
+def close():
+    """Closes the shared client (e.g. on worker shutdown)."""
+    global _client, _client_pid
+    with _lock:
+        if _client is not None:
+            _client.close()
+        _client = None
+        _client_pid = None
+
+
+if __name__ == "__main__":
+    ensure_indexes(log=True)
+    for collection, indexes in index_usage().items():
+        for index, stats in indexes.items():
+            print(f"{collection}.{index}: {stats['ops']} ops since {stats['since']}")
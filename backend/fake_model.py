@@ -0,0 +1,48 @@
+# fake_model.py
+# Stand-in for the Gemini model with configurable latency, for local
+# development and load tests (set LLM_BACKEND=fake).
+
+import json
+import time
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeModel:
+    """
+    Mimics genai.GenerativeModel.generate_content.
+
+    Args:
+        latency: Seconds each call takes before it answers.
+        entries: Schedule entries returned as the JSON response.
+    """
+
+    def __init__(self, latency=2.0, entries=None):
+        self.latency = latency
+        self.entries = entries if entries is not None else [{
+            "commitment": "Gym",
+            "day": "Monday",
+            "start_time": "07:00",
+            "end_time": "08:00",
+            "location": "Werblin Recreation Center"
+        }]
+        self.calls = 0
+
+    def generate_content(self, prompt, stream=False):
+        self.calls += 1
+        text = json.dumps(self.entries)
+        if stream:
+            return self._stream(text)
+        time.sleep(self.latency)
+        return FakeResponse(text)
+
+    def _stream(self, text, chunks=8):
+        # Spread the latency across chunks, the way tokens trickle in
+        size = max(1, -(-len(text) // chunks))
+        pieces = [text[i:i + size] for i in range(0, len(text), size)]
+        for piece in pieces:
+            time.sleep(self.latency / len(pieces))
+            yield FakeResponse(piece)
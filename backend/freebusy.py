@@ -0,0 +1,281 @@
+# freebusy.py
+# Weekly free/busy bitmaps: one bit per five-minute slot, 7 x 288 slots.
+#
+# A week is a single Python int of 2016 bits; bit (day * 288 + slot) is set
+# when the user is busy in that slot. Conflict checks, free-time search and
+# overlap counts are then a handful of whole-week &, |, ~ operations, which
+# CPython runs over the int's machine words in C, instead of comparing
+# events pair by pair.
+
+from datetime import timedelta
+
+from schedule_events import DAYS
+from ics_parser import _resolve_day, occurs_on
+from schedule_index import entry_bounds
+
+SLOT_MINUTES = 5
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES   # 288
+WEEK_SLOTS = 7 * SLOTS_PER_DAY            # 2016
+DAY_MASK = (1 << SLOTS_PER_DAY) - 1
+WEEK_MASK = (1 << WEEK_SLOTS) - 1
+
+
+# 🧮 Busy slots [first, last) covering [start, end) minutes; partly used slots count as busy
+def slot_range(start, end):
+    first = max(0, start) // SLOT_MINUTES
+    last = min(SLOTS_PER_DAY, -(-end // SLOT_MINUTES))
+    return first, max(first, last)
+
+
+# 🧮 Bitmask for [start, end) minutes on one weekday (0 = Monday)
+def span_mask(weekday, start, end):
+    first, last = slot_range(start, end)
+    return ((1 << (last - first)) - 1) << (weekday * SLOTS_PER_DAY + first)
+
+
+def iter_runs(bits):
+    """Yields (first_bit, last_bit) for each run of set bits, lowest first."""
+    while bits:
+        low = bits & -bits
+        first = low.bit_length() - 1
+        carried = bits + low            # clears the run, sets the bit just above it
+        last = (carried & -carried).bit_length() - 1
+        yield first, last
+        bits &= carried
+
+
+def iter_bits(bits):
+    """Yields the index of each set bit, lowest first."""
+    while bits:
+        low = bits & -bits
+        yield low.bit_length() - 1
+        bits ^= low
+
+
+class FreeBusy:
+    """
+    A user's busy time for one week as a 2016-bit int.
+
+    Build it from canonical events (FreeBusy.from_events) or from WebReg
+    courses (FreeBusy.from_webreg), then combine bitmaps with & and | or ask
+    for conflicts, free blocks and overlap.
+
+    Args:
+        bits: Busy bitmap; bit (weekday * 288 + slot) covers minutes
+            [slot * 5, slot * 5 + 5) of that weekday.
+    """
+
+    __slots__ = ("bits",)
+
+    def __init__(self, bits=0):
+        self.bits = bits & WEEK_MASK
+
+    @classmethod
+    def from_events(cls, events, week=None):
+        """
+        Marks every event's time as busy.
+
+        With `week` (any date in the week, or an ISO string), only events that
+        actually occur on that week's dates count, so one-off events, recess
+        EXDATEs and recurrence ranges are respected. Without it every event is
+        treated as weekly.
+        """
+        monday = None
+        if week is not None:
+            on_date = _resolve_day(week)[1]
+            if on_date is None:
+                raise ValueError(f"week must be a date, not a weekday: {week}")
+            monday = on_date - timedelta(days=on_date.weekday())
+
+        bits = 0
+        for event in events:
+            weekday = DAYS.index(event["day"])
+            if monday is not None and not occurs_on(event, monday + timedelta(days=weekday)):
+                continue
+            bits |= span_mask(weekday, *entry_bounds(event))
+        return cls(bits)
+
+    @classmethod
+    def from_webreg(cls, schedule_data):
+        """Marks the meeting times of a scraped WebReg schedule (minute ranges) as busy."""
+        bits = 0
+        for course in schedule_data.get("courses", []):
+            for meeting in course.get("meeting_times", []):
+                if meeting.get("day") not in DAYS or not meeting.get("range"):
+                    continue  # e.g. asynchronous or by-arrangement sections
+                start, end = meeting["range"]
+                bits |= span_mask(DAYS.index(meeting["day"]), start, end)
+        return cls(bits)
+
+    def __or__(self, other):
+        return FreeBusy(self.bits | other.bits)
+
+    def __and__(self, other):
+        return FreeBusy(self.bits & other.bits)
+
+    def __eq__(self, other):
+        return isinstance(other, FreeBusy) and self.bits == other.bits
+
+    def __repr__(self):
+        return f"FreeBusy(busy_minutes={self.busy_minutes()})"
+
+    def free(self):
+        """The complement: slots where the user is free."""
+        return FreeBusy(~self.bits & WEEK_MASK)
+
+    def busy_minutes(self):
+        return self.bits.bit_count() * SLOT_MINUTES
+
+    def is_busy(self, day, start, end):
+        """Whether any slot of [start, end) minutes on `day` is busy."""
+        return bool(self.bits & span_mask(DAYS.index(day), start, end))
+
+    def conflicts(self, event):
+        """Whether an event (canonical or "HH:MM" assistant entry) overlaps busy time."""
+        return self.is_busy(event["day"], *entry_bounds(event))
+
+    def overlap_minutes(self, other):
+        """Minutes per week both bitmaps are busy."""
+        return (self.bits & other.bits).bit_count() * SLOT_MINUTES
+
+    def blocks(self):
+        """Busy blocks as [{"day", "start", "end"}] sorted by day then start."""
+        return _blocks(self.bits)
+
+    def free_blocks(self, min_minutes=SLOT_MINUTES, start=0, end=24 * 60, days=DAYS):
+        """
+        Free blocks of at least `min_minutes`, searched within [start, end)
+        minutes on each of `days`.
+        """
+        return [block for block in _blocks(~self.bits & window_mask(start, end, days))
+                if block["end"] - block["start"] >= min_minutes]
+
+
+def _blocks(bits):
+    # Runs never cross midnight: split each day's bits out before scanning
+    blocks = []
+    for weekday, day in enumerate(DAYS):
+        day_bits = (bits >> (weekday * SLOTS_PER_DAY)) & DAY_MASK
+        for first, last in iter_runs(day_bits):
+            blocks.append({"day": day, "start": first * SLOT_MINUTES, "end": last * SLOT_MINUTES})
+    return blocks
+
+
+# 🧮 Mask of slots on each weekday within [start, end) minutes
+def window_mask(start=0, end=24 * 60, days=DAYS):
+    mask = 0
+    for day in days:
+        mask |= span_mask(DAYS.index(day), start, end)
+    return mask
+
+
+def bit_sliced_counts(bitmaps):
+    """
+    Adds bitmaps slot-wise into bit planes: planes[i] holds bit i of every
+    slot's count. Each bitmap is rippled in with XOR/AND carries, so N
+    bitmaps cost O(N log N) whole-week operations instead of N * 2016
+    per-slot additions.
+    """
+    planes = []
+    for bits in bitmaps:
+        carry = bits
+        for i in range(len(planes)):
+            if not carry:
+                break
+            planes[i], carry = planes[i] ^ carry, planes[i] & carry
+        if carry:
+            planes.append(carry)
+    return planes
+
+
+def count_at_least(planes, k):
+    """Slots whose bit-sliced count is >= k, compared plane by plane from the top."""
+    if k <= 0:
+        return WEEK_MASK
+    if k >> len(planes):
+        return 0  # more than any count the planes can hold
+    greater, equal = 0, WEEK_MASK
+    for i in reversed(range(len(planes))):
+        plane = planes[i]
+        if (k >> i) & 1:
+            equal &= plane
+        else:
+            greater |= equal & plane
+            equal &= ~plane
+    return greater | equal
+
+
+def free_for(free_bits, slots):
+    """Slots that start `slots` consecutive free slots (shifted ANDs, log2(slots) of them)."""
+    run, length = free_bits, 1
+    while length * 2 <= slots:
+        run &= run >> length
+        length *= 2
+    if length < slots:
+        run &= run >> (slots - length)
+    return run
+
+
+def group_availability(members, duration=60, start=0, end=24 * 60, days=DAYS,
+                       step=15, min_available=1, limit=10):
+    """
+    Common free time for a group of FreeBusy bitmaps.
+
+    Returns the blocks where everyone is free (AND of the free bitmaps),
+    and candidate meeting times of `duration` minutes starting every `step`
+    minutes inside [start, end), ranked by how many members are free for
+    the whole meeting, then by day and time. Per-slot attendance comes
+    from bit-sliced counts, so the work grows with log(group size) per
+    candidate rather than with the group size.
+
+    Args:
+        members: {name: FreeBusy}.
+        min_available: Fewest free members a candidate may have.
+        limit: Most candidates to return.
+
+    Returns:
+        dict: {"common_free": [...blocks], "candidates": [{"day", "start",
+        "end", "available", "unavailable": [names]}]}
+    """
+    window = window_mask(start, end, days)
+    slots = max(1, -(-duration // SLOT_MINUTES))
+    names = list(members)
+
+    common = window
+    fits = []
+    for name in names:
+        free_bits = ~members[name].bits & window
+        common &= free_bits
+        fits.append(free_for(free_bits, slots))
+
+    # Candidate starts: on the step grid, and the whole meeting inside the window
+    step_slots = max(1, step // SLOT_MINUTES)
+    grid = 0
+    for weekday in range(7):
+        for slot in range(0, SLOTS_PER_DAY - slots + 1, step_slots):
+            grid |= 1 << (weekday * SLOTS_PER_DAY + slot)
+    grid &= free_for(window, slots)
+
+    planes = bit_sliced_counts(fits)
+    candidates, taken = [], 0
+    for k in range(len(names), max(min_available, 1) - 1, -1):
+        if len(candidates) >= limit:
+            break
+        starts = count_at_least(planes, k) & grid & ~taken
+        taken |= starts
+        for bit in iter_bits(starts):
+            if len(candidates) >= limit:
+                break
+            weekday, slot = divmod(bit, SLOTS_PER_DAY)
+            candidates.append({
+                "day": DAYS[weekday],
+                "start": slot * SLOT_MINUTES,
+                "end": slot * SLOT_MINUTES + duration,
+                "available": k,
+                "unavailable": [name for name, fit in zip(names, fits) if not (fit >> bit) & 1]
+            })
+
+    return {
+        "common_free": [block for block in _blocks(common) if block["end"] - block["start"] >= duration],
+        "candidates": candidates
+    }
@@ -0,0 +1,344 @@
+# ics_parser.py
+# Fast ICS -> canonical event parser, plus an in-memory index for querying
+# which events occur on a given day and time window.
+#
+# The parser reads content lines directly (unfolding, parameters, TEXT
+# escapes) instead of building the ics library's object model. Recurring
+# events are kept as rules; nothing is expanded until a query asks about a
+# specific date, so a semester-long weekly class costs one event, not ~15.
+
+from datetime import date, datetime, timedelta
+from zoneinfo import ZoneInfo
+
+from schedule_events import DAYS, TZID, make_event, normalize_day, occurs_together
+from schedule_index import ScheduleIndex, entry_bounds
+
+LOCAL_ZONE = ZoneInfo(TZID)
+BYDAY = {"MO": 0, "TU": 1, "WE": 2, "TH": 3, "FR": 4, "SA": 5, "SU": 6}
+
+
+# 📜 Unfold lines and split each into (NAME, {PARAM: value}, value)
+def iter_content_lines(ics_string):
+    line = None
+    for raw in ics_string.replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        if raw[:1] in (" ", "\t") and line is not None:
+            line += raw[1:]  # folded continuation
+            continue
+        if line:
+            parsed = _split_content_line(line)
+            if parsed:
+                yield parsed
+        line = raw
+    if line:
+        parsed = _split_content_line(line)
+        if parsed:
+            yield parsed
+
+
+def _split_content_line(line):
+    # The value starts at the first ':' outside a quoted parameter value
+    quoted = False
+    for i, char in enumerate(line):
+        if char == '"':
+            quoted = not quoted
+        elif char == ":" and not quoted:
+            head, value = line[:i], line[i + 1:]
+            break
+    else:
+        return None
+
+    name, *param_parts = head.split(";")
+    params = {}
+    for part in param_parts:
+        if "=" in part:
+            key, param_value = part.split("=", 1)
+            params[key.upper()] = param_value.strip('"')
+    return name.strip().upper(), params, value
+
+
+def unescape_text(value):
+    out, i = [], 0
+    while i < len(value):
+        char = value[i]
+        if char == "\\" and i + 1 < len(value):
+            nxt = value[i + 1]
+            out.append("\n" if nxt in "nN" else nxt)
+            i += 2
+        else:
+            out.append(char)
+            i += 1
+    return "".join(out)
+
+
+def _is_date_value(value, params=None):
+    return len(value.strip()) == 8 or (params or {}).get("VALUE") == "DATE"
+
+
+# 🕒 DATE / DATE-TIME value -> local (America/New_York) naive datetime
+def parse_ics_datetime(value, params=None):
+    value = value.strip()
+    if _is_date_value(value, params):
+        return datetime.strptime(value[:8], "%Y%m%d")
+    moment = datetime.strptime(value[:15], "%Y%m%dT%H%M%S")
+    if value.endswith("Z"):
+        moment = moment.replace(tzinfo=ZoneInfo("UTC")).astimezone(LOCAL_ZONE).replace(tzinfo=None)
+    elif (params or {}).get("TZID") not in (None, TZID):
+        try:
+            zone = ZoneInfo(params["TZID"])
+            moment = moment.replace(tzinfo=zone).astimezone(LOCAL_ZONE).replace(tzinfo=None)
+        except Exception:
+            pass  # unknown TZID: keep the wall-clock time as written
+    return moment
+
+
+def parse_rrule(value):
+    return {key.upper(): v for key, v in (part.split("=", 1) for part in value.split(";") if "=" in part)}
+
+
+def _recurrences(begin, rule, exdates):
+    """
+    Maps one VEVENT's RRULE onto canonical weekly recurrences, one per
+    weekday it repeats on. Returns None for rules that are not weekly or
+    daily, or that end before their first weekday (the event is then kept
+    as a one-off on its first date), and [] for COUNT=0 (no occurrences).
+
+    Raises:
+        ValueError: For malformed COUNT, INTERVAL or UNTIL values.
+    """
+    freq = rule.get("FREQ", "WEEKLY").upper()
+    interval = int(rule.get("INTERVAL", "1") or 1)
+    if interval < 1:
+        raise ValueError(f"Invalid INTERVAL: {interval}")
+    if freq == "WEEKLY":
+        weekdays = [BYDAY[d[-2:]] for d in rule.get("BYDAY", "").split(",") if d[-2:] in BYDAY]
+        weekdays = weekdays or [begin.weekday()]
+    elif freq == "DAILY" and interval == 1:
+        weekdays = [BYDAY[d[-2:]] for d in rule.get("BYDAY", "").split(",") if d[-2:] in BYDAY] or list(range(7))
+    else:
+        return None
+
+    until = parse_ics_datetime(rule["UNTIL"]).date() if "UNTIL" in rule else None
+    if "COUNT" in rule and until is None:
+        until = _count_until(begin.date(), sorted(set(weekdays)), interval, int(rule["COUNT"]))
+        if until is None:
+            return []  # COUNT=0: the rule has no occurrences
+
+    recurrences = []
+    for weekday in sorted(set(weekdays)):
+        first = begin.date() + timedelta(days=(weekday - begin.weekday()) % 7)
+        if weekday < begin.weekday():
+            first += timedelta(days=7 * (interval - 1))  # wrapped into the next week; skip to the next active one
+        if until and first > until:
+            continue
+        recurrence = {
+            "freq": "WEEKLY",
+            "starts": first.isoformat(),
+            "until": until.isoformat() if until else None,
+            "exdates": sorted(d for d in exdates if date.fromisoformat(d).weekday() == weekday)
+        }
+        if interval > 1:
+            recurrence["interval"] = interval
+        recurrences.append((weekday, recurrence))
+    return recurrences or None
+
+
+def _count_until(first, weekdays, interval, count):
+    # Date of the COUNT-th occurrence: the first week only has the weekdays on
+    # or after `first`, every later active week (each `interval`-th) has all
+    if count <= 0:
+        return None
+    monday = first - timedelta(days=first.weekday())
+    first_week = [d for d in weekdays if d >= first.weekday()]
+    if count <= len(first_week):
+        return monday + timedelta(days=first_week[count - 1])
+    weeks, position = divmod(count - len(first_week) - 1, len(weekdays))
+    try:
+        return monday + timedelta(weeks=(weeks + 1) * interval, days=weekdays[position])
+    except OverflowError:
+        return date.max  # effectively endless
+
+
+# 📥 Parse a serialized ICS calendar into canonical events
+def parse_ics(ics_string, source="ics"):
+    """
+    Parses VEVENTs into canonical events (see schedule_events.py).
+
+    Weekly and daily RRULEs become one weekly recurrence per weekday, with
+    UNTIL (or COUNT), INTERVAL and EXDATEs kept on the rule rather than
+    expanded. Times are converted to America/New_York wall-clock minutes.
+    VEVENTs without a usable DTSTART are skipped instead of failing the
+    whole calendar.
+    """
+    events = []
+    current = None
+    nested = 0  # depth of sub-components (e.g. VALARM) inside the current VEVENT
+    for name, params, value in iter_content_lines(ics_string):
+        component = value.strip().upper()
+        if name == "BEGIN":
+            if current is not None:
+                nested += 1
+            elif component == "VEVENT":
+                current, nested = {"exdates": []}, 0
+        elif name == "END":
+            if current is not None and nested:
+                nested -= 1
+            elif current is not None and component == "VEVENT":
+                events.extend(_vevent_to_events(current, source))
+                current = None
+        elif current is not None and not nested:
+            if name == "EXDATE":
+                current["exdates"].extend((v, params) for v in value.split(",") if v)
+            elif name not in current:
+                current[name] = (value, params)
+    return events
+
+
+def _vevent_to_events(props, source):
+    try:
+        begin = parse_ics_datetime(*props["DTSTART"])
+        if "DTEND" in props:
+            end = parse_ics_datetime(*props["DTEND"])
+        elif "DURATION" in props:
+            end = begin + _parse_duration(props["DURATION"][0])
+        elif _is_date_value(*props["DTSTART"]):
+            end = begin + timedelta(days=1)  # all-day event (RFC 5545 3.6.1)
+        else:
+            end = begin
+        if end < begin:
+            raise ValueError("DTEND before DTSTART")
+
+        recurrences = None
+        if "RRULE" in props:
+            exdates = sorted({parse_ics_datetime(v, p).date().isoformat() for v, p in props["exdates"]})
+            recurrences = _recurrences(begin, parse_rrule(props["RRULE"][0]), exdates)
+            if recurrences == []:
+                return []  # the rule never occurs
+    except (KeyError, ValueError):
+        return []  # malformed VEVENT: skip it, keep the rest of the calendar
+
+    start = begin.hour * 60 + begin.minute
+    stop = end.hour * 60 + end.minute if end.date() == begin.date() else 24 * 60
+    if stop <= start and end > begin:
+        stop = 24 * 60  # runs past midnight; clip to the end of the day
+
+    def text(key):
+        return unescape_text(props[key][0]) if key in props else ""
+
+    fields = {
+        "title": text("SUMMARY") or "Untitled",
+        "start": start,
+        "end": stop,
+        "location": text("LOCATION"),
+        "description": text("DESCRIPTION"),
+        "source": source
+    }
+
+    if not recurrences:
+        return [make_event(day=DAYS[begin.weekday()], date=begin.date().isoformat(), **fields)]
+    return [make_event(day=DAYS[weekday], recurrence=recurrence, **fields) for weekday, recurrence in recurrences]
+
+
+def _parse_duration(value):
+    # e.g. PT1H20M, P1D
+    value = value.strip().lstrip("+").upper()
+    days = hours = minutes = seconds = 0
+    number = ""
+    in_time = False
+    for char in value.lstrip("P"):
+        if char == "T":
+            in_time = True
+        elif char.isdigit():
+            number += char
+        else:
+            n = int(number or 0)
+            number = ""
+            if char == "W": days += 7 * n
+            elif char == "D": days += n
+            elif char == "H" and in_time: hours += n
+            elif char == "M" and in_time: minutes += n
+            elif char == "S" and in_time: seconds += n
+    return timedelta(days=days, hours=hours, minutes=minutes, seconds=seconds)
+
+
+# 📅 Does a canonical event happen on this calendar date?
+def occurs_on(event, on_date, exdates=None):
+    if DAYS[on_date.weekday()] != event["day"]:
+        return False
+    if event.get("date"):
+        return event["date"] == on_date.isoformat()
+    recurrence = event.get("recurrence")
+    if not recurrence:
+        return True  # undated weekly entry
+    iso = on_date.isoformat()
+    if recurrence.get("starts") and iso < recurrence["starts"]:
+        return False
+    if recurrence.get("until") and iso > recurrence["until"]:
+        return False
+    interval = recurrence.get("interval", 1)
+    if interval > 1 and recurrence.get("starts"):
+        if (on_date - date.fromisoformat(recurrence["starts"])).days // 7 % interval:
+            return False
+    return iso not in (exdates if exdates is not None else recurrence.get("exdates", ()))
+
+
+def _resolve_day(day):
+    # (weekday name, date or None) for a date, datetime, ISO string or weekday name
+    if isinstance(day, datetime):
+        day = day.date()
+    if isinstance(day, date):
+        return DAYS[day.weekday()], day
+    weekday, iso = normalize_day(day)
+    return weekday, date.fromisoformat(iso) if iso else None
+
+
+class ScheduleQuery:
+    """
+    Answers "what is on day X between t1 and t2" over canonical events.
+
+    Events are indexed by weekday in a ScheduleIndex, so a query only
+    touches the intervals overlapping [t1, t2) on that weekday. For a
+    concrete date, each candidate's recurrence (range, INTERVAL, EXDATEs)
+    is checked for that one date; no series is ever expanded.
+
+    Args:
+        events: Canonical events, e.g. from parse_ics or MongoDB.
+    """
+
+    def __init__(self, events=()):
+        self._index = ScheduleIndex()
+        self._events = {}   # seq -> event
+        self._exdates = {}  # seq -> frozenset of ISO exdates
+        for event in events:
+            seq = self._index.add(event)
+            self._events[seq] = event
+            self._exdates[seq] = frozenset((event.get("recurrence") or {}).get("exdates", ()))
+
+    def __len__(self):
+        return len(self._events)
+
+    def on(self, day, start=0, end=24 * 60):
+        """
+        Events on `day` overlapping [start, end) minutes, sorted by start.
+
+        `day` is a weekday name (every event on that weekday) or a date /
+        ISO date string (only events that actually occur that date).
+        """
+        weekday, on_date = _resolve_day(day)
+        seqs = [seq for _, _, seq in self._index.overlapping(weekday, start, end)]
+        if on_date:
+            seqs = [seq for seq in seqs if occurs_on(self._events[seq], on_date, self._exdates[seq])]
+        return sorted((self._events[seq] for seq in seqs), key=entry_bounds)
+
+    def occurrences(self, first, last, start=0, end=24 * 60):
+        """Lazily yields (date, event) for every occurrence between two dates (inclusive)."""
+        d, last = _resolve_day(first)[1], _resolve_day(last)[1]
+        while d <= last:
+            for event in self.on(d, start, end):
+                yield d, event
+            d += timedelta(days=1)
+
+    def conflicts(self, event):
+        """Indexed events whose time and date ranges overlap `event`'s."""
+        start, end = entry_bounds(event)
+        return [self._events[seq] for _, _, seq in self._index.overlapping(event["day"], start, end)
+                if self._events[seq] is not event and occurs_together(self._events[seq], event)]
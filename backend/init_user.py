@@ -1,5 +1,6 @@
-from pymongo import MongoClient
 from werkzeug.security import generate_password_hash
+import argparse
+from pymongo.errors import DuplicateKeyError
 from dotenv import load_dotenv
 import os
 import sys
@@ -8,28 +9,37 @@ import sys
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from scrapers import authenticate as auth
-from scrapers.webreg import semester_code, webreg_schedule, convert_webreg_json_to_ics
-from scrapers.academic_calendar import scrape_academic_calendar
+from scrapers.webreg import (semester_code, webreg_schedules, webreg_schedules_http, save_webreg_schedule,
+                             convert_webreg_json_to_ics, convert_webreg_json_to_events,
+                             schedule_fingerprint, diff_fingerprints)
+from scrapers.academic_calendar import refresh_academic_calendar_if_stale
+from scrapers.timing import timings
+
+from db import users, ensure_indexes, has_unique_netid_index
 
-# Load env and connect to MongoDB
 load_dotenv()
-client = MongoClient(os.getenv("MONGO_URI"))
-db = client["authndb"]
-users = db["users"]
 
-# If no academic_calendar.json exists, scrape it and create one
-if not os.path.exists("./scrapers/academic_calendar.json"):
-    scrape_academic_calendar(log=True)
+# Default MongoDB document for a newly onboarded user
+def new_user_document(netid):
+    return {
+        "netid": netid,
+        "password_hash": generate_password_hash("placeholder123"),  # TODO: Replace securely later
+        "current_schedule": [],
+        "past_schedules": [],
+        "prompt_history": [],
+        "friends": {}  # maps friend's netid -> latest shared schedule events
+    }
 
 def create_user(user_profile, log=False):
     """
     Creates a new user record in the MongoDB 'users' collection if the user
     does not already exist.
 
-    This function checks for the existence of a user by their 'netid' in the
-    'rumad' database. If no record is found, it inserts a new user document
-    with default values, including a placeholder password hash, empty schedule
-    fields, and an empty friends mapping.
+    This function inserts a new user document with default values, including
+    a placeholder password hash, empty schedule fields, and an empty friends
+    mapping. If a record with the same 'netid' already exists, the unique
+    netid index rejects the insert (or, until that index is confirmed, an
+    existence check skips it) and the existing record is kept.
 
     Args:
         user_profile : Dictionary containing Rutgers student user information,
@@ -41,56 +51,139 @@ def create_user(user_profile, log=False):
     """
 
     netid = user_profile.get("netid")
-    if netid and not users.find_one({"netid": netid}):
-        if log: print(f"[MongoDB] Creating new user record for {netid}")
-        users.insert_one({
-            "netid": netid,
-            "password_hash": generate_password_hash("placeholder123"),  # TODO: Replace securely later
-            "current_schedule": "",
-            "past_schedules": [],
-            "prompt_history": [],
-            "friends": {}  # maps friend's netid -> latest .ics string
-        })
+    if not netid:
+        return user_profile
+    if not has_unique_netid_index() and users.find_one({"netid": netid}, {"_id": 1}):
+        return user_profile  # user already exists; no unique index to reject the insert
+    try:
+        users.insert_one(new_user_document(netid))
+        if log: print(f"[MongoDB] Created new user record for {netid}")
+    except DuplicateKeyError:
+        pass  # user already exists (unique netid index)
     return user_profile
 
-# Save the ICS string to MongoDB under current_schedule
-def save_ics_to_user(netid, ics_path):
-    with open(ics_path, "r") as f:
-        ics_data = f.read()
-    users.update_one({"netid": netid}, {"$set": {"current_schedule": ics_data}})
+# Save the schedule's structured events to MongoDB under current_schedule
+def save_schedule_to_user(netid, events):
+    users.update_one({"netid": netid}, {"$set": {"current_schedule": events}})
     print(f"[MongoDB] Updated current_schedule for {netid}")
 
-# Initialize a user and their preliminary schedule given their username
-def init_user(username, semesters=["Fall 2025"]):
-    # Initialize a new user in the MongoDB database
-    user_profile = auth.scrape(auth.get_user_cas_data, username=username, log=True)
+# Scrape a user's CAS profile and WebReg schedules without touching MongoDB.
+# Writes the JSON/ICS exports and returns (user_profile, events of the latest
+# semester that has a schedule, fingerprint fields to $set), or
+# (None, None, None) if the profile scrape failed.
+# Both scrapes go over plain HTTPS with the stored cookies when they are still
+# valid; Chrome is only started when a Duo login is needed.
+def scrape_user(username, semesters, pool=None):
+    user_profile = auth.scrape(auth.get_user_cas_data, username=username, log=True, pool=pool,
+                               http_fn=auth.get_user_cas_data_http)
     if not user_profile:
-        print("Something went wrong. Try again.")
-        return
-    create_user(user_profile)
+        return None, None, None
 
-    # Scrape the schedule for each semester
+    # 1. Scrape WebReg for every semester in one session and save JSON
+    print(f"\n>>> Scraping {username} for {', '.join(semesters)}...")
+    schedules = auth.scrape(webreg_schedules, username=username, semesters=semesters,
+                            log=True, save=True, pool=pool, http_fn=webreg_schedules_http) or {}
+
+    current_events = None
+    fingerprints = {}
     for semester in semesters:
-        print(f"\n>>> Scraping {username} for {semester}...")
-        
-        # 1. Scrape WebReg and save JSON
-        schedule = auth.scrape(webreg_schedule, username=username, semester=semester, log=True, save=True)
+        schedule = schedules.get(semester)
         if not schedule: continue  # skip if no schedule JSON was generated
 
-        # 2. Convert JSON to ICS
+        # 2. Convert JSON to ICS (local export)
         ics_path = f"./.users/{username}/{semester_code(semester)}_schedule.ics"
         convert_webreg_json_to_ics(schedule, ics_path)
 
-        # 3. Save ICS to MongoDB
-        save_ics_to_user(username, ics_path)
+        # 3. Structured events for MongoDB; the last semester scraped wins
+        events = convert_webreg_json_to_events(schedule)
+        if events is not None:
+            current_events = events
+        fingerprints[fingerprint_field(semester)] = schedule_fingerprint(schedule)
+
+    return user_profile, current_events, fingerprints
+
+# MongoDB field holding a semester's schedule fingerprint
+def fingerprint_field(semester):
+    return f"schedule_fingerprints.{semester_code(semester)}"
+
+# Re-scrape a known user's schedules and only rewrite what changed.
+# Each semester's scrape is fingerprinted (see schedule_fingerprint) and
+# compared with the fingerprint stored on the user document; unchanged
+# semesters skip the JSON/ICS exports and the MongoDB write entirely.
+# Returns {semester: diff} with the added/dropped/modified sections.
+def refresh_user(username, semesters, pool=None):
+    schedules = auth.scrape(webreg_schedules, username=username, semesters=semesters,
+                            log=True, pool=pool, http_fn=webreg_schedules_http) or {}
+    stored = (users.find_one({"netid": username}, {"schedule_fingerprints": 1}) or {}).get("schedule_fingerprints", {})
+
+    diffs = {}
+    updates = {}
+    for semester in semesters:
+        schedule = schedules.get(semester)
+        if not schedule: continue  # scrape failed or semester unavailable; keep what we have
+
+        fingerprint = schedule_fingerprint(schedule)
+        diff = diffs[semester] = diff_fingerprints(stored.get(semester_code(semester)), fingerprint)
+        if not diff["changed"]:
+            print(f"[refresh] {username} {semester}: unchanged")
+            continue
+
+        print(f"[refresh] {username} {semester}: +{len(diff['added'])} -{len(diff['dropped'])} "
+              f"~{len(diff['modified'])}")
+        for label in diff["added"]: print(f"   + {label}")
+        for label in diff["dropped"]: print(f"   - {label}")
+        for label in diff["modified"]: print(f"   ~ {label}")
+
+        save_webreg_schedule(username, semester, schedule)
+        convert_webreg_json_to_ics(schedule, f"./.users/{username}/{semester_code(semester)}_schedule.ics")
+        updates[fingerprint_field(semester)] = fingerprint
+
+    # current_schedule follows the last semester with a schedule, as in scrape_user
+    latest = next((s for s in reversed(semesters) if schedules.get(s)), None)
+    if latest and fingerprint_field(latest) in updates:
+        events = convert_webreg_json_to_events(schedules[latest])
+        if events is not None:
+            updates["current_schedule"] = events
+
+    if updates:
+        users.update_one({"netid": username}, {"$set": updates})
+        print(f"[MongoDB] Updated {', '.join(sorted(updates))} for {username}")
+    return diffs
+
+# Initialize a user and their preliminary schedule given their username
+def init_user(username, semesters=["Fall 2025"]):
+    user_profile, events, fingerprints = scrape_user(username, semesters)
+    if not user_profile:
+        print("Something went wrong. Try again.")
+        return
+
+    # Initialize a new user in the MongoDB database, then save their schedule
+    create_user(user_profile)
+    if events is not None:
+        save_schedule_to_user(username, events)
+    if fingerprints:
+        users.update_one({"netid": username}, {"$set": fingerprints})
 
 # List of usernames + semesters to scrape and store
 usernames = ["am3606"]
 semesters = ["Winter 2025", "Spring 2025", "Summer 2025", "Fall 2025"]
 
 def main():
+    parser = argparse.ArgumentParser(description="Onboard or refresh RUPlanner users.")
+    parser.add_argument("--refresh", action="store_true",
+                        help="Only rewrite semesters whose WebReg schedule changed")
+    args = parser.parse_args()
+
+    ensure_indexes(log=True)
+    # Scrape academic_calendar.json if it is missing; otherwise re-check it
+    # (a conditional request) at most once a day
+    refresh_academic_calendar_if_stale(log=True)
     for username in usernames:
-        init_user(username, semesters)
+        if args.refresh:
+            refresh_user(username, semesters)
+        else:
+            init_user(username, semesters)
+    timings.report()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,216 @@
+# jobs.py
+# Background job queue for slow work (LLM calls) submitted over HTTP.
+#
+# A request submits a job and gets an id back right away; the work runs on a
+# thread pool and clients poll for the result. That keeps web worker threads
+# free while Gemini takes seconds to answer.
+#
+# Job records live in a MongoDB collection (TTL-indexed on expires_at, like
+# llm_cache), so a poll can land on any gunicorn worker. A job records the
+# name of its handler and its arguments; if the worker running it dies, the
+# job's lease runs out and the next worker that sees it runs it again.
+
+import threading
+import traceback
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from pymongo import ReturnDocument
+
+from db import get_collection
+
+
+class QueueFull(Exception):
+    """This process already has max_pending jobs queued or running."""
+
+
+class MemoryJobStore:
+    """Job records in a dict; only for a single process (tests, benchmarks)."""
+
+    def __init__(self):
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def insert(self, job):
+        with self._lock:
+            now = datetime.utcnow()
+            for job_id in [j for j, doc in self._jobs.items() if doc["expires_at"] < now]:
+                del self._jobs[job_id]
+            self._jobs[job["job_id"]] = dict(job)
+
+    def update(self, job_id, fields):
+        with self._lock:
+            if job_id in self._jobs:
+                self._jobs[job_id].update(fields)
+
+    def get(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            return dict(job) if job and job["expires_at"] >= datetime.utcnow() else None
+
+    def claim(self, job_id, now, fields):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if not job or job["status"] not in ("queued", "running") or job["lease_until"] >= now:
+                return None
+            job.update(fields)
+            job["attempts"] += 1
+            return dict(job)
+
+
+class MongoJobStore:
+    """Job records in a MongoDB collection shared by every worker."""
+
+    def __init__(self, collection):
+        self.collection = collection
+
+    def insert(self, job):
+        get_collection(self.collection).insert_one(dict(job))
+
+    def update(self, job_id, fields):
+        get_collection(self.collection).update_one({"job_id": job_id}, {"$set": fields})
+
+    def get(self, job_id):
+        return get_collection(self.collection).find_one(
+            {"job_id": job_id, "expires_at": {"$gt": datetime.utcnow()}}, {"_id": 0}
+        )
+
+    def claim(self, job_id, now, fields):
+        # Atomic: only one worker can take over a job whose lease has run out
+        return get_collection(self.collection).find_one_and_update(
+            {"job_id": job_id, "status": {"$in": ["queued", "running"]}, "lease_until": {"$lt": now}},
+            {"$set": fields, "$inc": {"attempts": 1}},
+            projection={"_id": 0},
+            return_document=ReturnDocument.AFTER
+        )
+
+
+class JobQueue:
+    """
+    Runs registered handlers on a thread pool and tracks their status.
+
+    Args:
+        max_workers: Number of jobs that may run at once in this process.
+        ttl: Seconds a finished job's result is kept for polling.
+        max_pending: Most jobs this process will hold queued or running;
+            submit raises QueueFull beyond that.
+        lease: Seconds a worker may hold a job before another worker
+            assumes it died and runs the job again.
+        max_attempts: Times a job is started before it is marked failed.
+        collection: Mongo collection for job records, or None to keep them
+            in this process only.
+    """
+
+    def __init__(self, max_workers=8, ttl=600, max_pending=64, lease=300, max_attempts=2, collection=None):
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self.store = MongoJobStore(collection) if collection else MemoryJobStore()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._handlers = {}
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    def register(self, name, fn):
+        """Makes fn runnable as job `name`; every worker must register the same handlers."""
+        self._handlers[name] = fn
+
+    def submit(self, name, *args):
+        """
+        Queues handler `name` with (JSON/BSON-serializable) args and returns
+        the new job's id.
+
+        Raises:
+            QueueFull: If this process's backlog is full.
+        """
+        if name not in self._handlers:
+            raise KeyError(f"Unknown job handler: {name}")
+        self._reserve()
+        now = datetime.utcnow()
+        job_id = uuid.uuid4().hex
+        try:
+            self.store.insert({
+                "job_id": job_id,
+                "name": name,
+                "args": list(args),
+                "status": "queued",
+                "result": None,
+                "error": None,
+                "attempts": 1,
+                "submitted_at": now,
+                "finished_at": None,
+                "lease_until": now + timedelta(seconds=self.lease),
+                "expires_at": now + timedelta(seconds=self.lease + self.ttl)
+            })
+        except Exception:
+            self._release()
+            raise
+        self._executor.submit(self._run, job_id, name, args)
+        return job_id
+
+    def _reserve(self):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                raise QueueFull(f"{self._pending} jobs already pending")
+            self._pending += 1
+
+    def _release(self):
+        with self._lock:
+            self._pending -= 1
+
+    def _run(self, job_id, name, args):
+        try:
+            self.store.update(job_id, {
+                "status": "running",
+                "lease_until": datetime.utcnow() + timedelta(seconds=self.lease)
+            })
+            result = self._handlers[name](*args)
+            self._finish(job_id, status="done", result=result)
+        except Exception as e:
+            traceback.print_exc()
+            self._finish(job_id, status="failed", error=str(e))
+        finally:
+            self._release()
+
+    def _finish(self, job_id, **fields):
+        now = datetime.utcnow()
+        self.store.update(job_id, {**fields, "finished_at": now, "expires_at": now + timedelta(seconds=self.ttl)})
+
+    def get(self, job_id):
+        """
+        Returns the job's state, or None if it is unknown or expired. A job
+        whose lease ran out (its worker died) is restarted here, or marked
+        failed once it has used max_attempts.
+        """
+        job = self.store.get(job_id)
+        if not job or job["status"] not in ("queued", "running"):
+            return job
+        now = datetime.utcnow()
+        if job["lease_until"] >= now:
+            return job
+
+        if job["attempts"] >= self.max_attempts or job["name"] not in self._handlers:
+            fields = {"status": "failed", "error": "Job was lost by its worker",
+                      "finished_at": now, "expires_at": now + timedelta(seconds=self.ttl)}
+            claimed = self.store.claim(job_id, now, fields)
+            return claimed or self.store.get(job_id)
+
+        try:
+            self._reserve()
+        except QueueFull:
+            return job  # leave it for a less busy worker
+        claimed = self.store.claim(job_id, now, {
+            "status": "queued",
+            "lease_until": now + timedelta(seconds=self.lease),
+            "expires_at": now + timedelta(seconds=self.lease + self.ttl)
+        })
+        if not claimed:
+            self._release()
+            return self.store.get(job_id)
+        self._executor.submit(self._run, job_id, claimed["name"], claimed["args"])
+        return claimed
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait)
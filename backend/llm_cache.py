@@ -0,0 +1,109 @@
+# llm_cache.py
+# Cache of prompt -> parsed schedule entries in front of the LLM.
+#
+# Keys are a hash of the normalized prompt plus the system-prompt version, so
+# "Gym MWF 7-8am" and "gym  mwf 7-8am." share an answer and bumping the system
+# prompt retires every old translation. Only responses that pass
+# validate_entries are stored.
+
+import hashlib
+import re
+from datetime import datetime, timedelta
+
+from cache import TTLCache
+from db import get_collection
+from schedule_events import normalize_day
+from schedule_index import to_minutes
+
+REQUIRED_FIELDS = ("commitment", "day", "start_time", "end_time")
+TIME_PATTERN = re.compile(r"^\d{1,2}:\d{2}$")
+
+
+def normalize_prompt(prompt):
+    """Lowercases, collapses whitespace and drops trailing punctuation."""
+    prompt = re.sub(r"\s+", " ", prompt.strip().lower())
+    return prompt.rstrip(".!?")
+
+
+def prompt_key(prompt, version):
+    return hashlib.sha256(f"{version}:{normalize_prompt(prompt)}".encode("utf-8")).hexdigest()
+
+
+def validate_entries(entries):
+    """Checks that an LLM response is a non-empty list of well-formed schedule entries."""
+    if not isinstance(entries, list) or not entries:
+        return False
+    for entry in entries:
+        if not isinstance(entry, dict) or any(not entry.get(f) for f in REQUIRED_FIELDS):
+            return False
+        if not (TIME_PATTERN.match(str(entry["start_time"])) and TIME_PATTERN.match(str(entry["end_time"]))):
+            return False
+        try:
+            normalize_day(entry["day"])
+            start, end = to_minutes(entry["start_time"]), to_minutes(entry["end_time"])
+        except ValueError:
+            return False
+        if not 0 <= start < end <= 24 * 60:
+            return False
+    return True
+
+
+class PromptCache:
+    """
+    Two-tier prompt cache: an in-process LRU, optionally backed by a MongoDB
+    collection shared by every worker. Mongo documents carry an expires_at
+    field that the collection's TTL index uses to delete them.
+
+    Args:
+        version: System-prompt version; part of every key.
+        maxsize: In-memory LRU size.
+        ttl: Seconds an answer stays valid in either tier.
+        collection: Name of the Mongo collection to use, or None for memory only.
+    """
+
+    def __init__(self, version, maxsize=1024, ttl=7 * 24 * 3600, collection=None):
+        self.version = version
+        self.ttl = ttl
+        self.memory = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.collection = collection
+        self.mongo_hits = 0
+
+    def get(self, prompt):
+        """Returns cached entries for the prompt, or None."""
+        key = prompt_key(prompt, self.version)
+        entries = self.memory.get(key)
+        if entries is None and self.collection:
+            doc = get_collection(self.collection).find_one(
+                {"key": key, "expires_at": {"$gt": datetime.utcnow()}}, {"entries": 1}
+            )
+            if doc:
+                self.mongo_hits += 1
+                entries = doc["entries"]
+                self.memory.put(key, entries)
+        return [dict(e) for e in entries] if entries is not None else None
+
+    def put(self, prompt, entries):
+        """Stores entries for the prompt if they pass validation; returns whether stored."""
+        if not validate_entries(entries):
+            return False
+        key = prompt_key(prompt, self.version)
+        entries = [dict(e) for e in entries]
+        self.memory.put(key, entries)
+        if self.collection:
+            get_collection(self.collection).update_one(
+                {"key": key},
+                {"$set": {
+                    "key": key,
+                    "version": self.version,
+                    "prompt": normalize_prompt(prompt),
+                    "entries": entries,
+                    "expires_at": datetime.utcnow() + timedelta(seconds=self.ttl)
+                }},
+                upsert=True
+            )
+        return True
+
+    def stats(self):
+        stats = self.memory.stats()
+        stats["mongo_hits"] = self.mongo_hits
+        return stats
@@ -1,50 +1,141 @@
 # llm_handler.py
 import os
 import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from dotenv import load_dotenv
-from pymongo import MongoClient
 import google.generativeai as genai
-from schedule_utils import merge_schedule, update_prompt_history
+from schedule_utils import merge_schedule, update_prompt_history, update_prompt_history_many
+from llm_cache import PromptCache
 
 
 # Load environment variables and set up LLM
 load_dotenv()
 genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
-model = genai.GenerativeModel("gemini-pro")
+if os.getenv("LLM_BACKEND") == "fake":
+    from fake_model import FakeModel
+    model = FakeModel(latency=float(os.getenv("LLM_FAKE_LATENCY", "2.0")))
+else:
+    model = genai.GenerativeModel("gemini-pro")
 
-# Set up MongoDB connection
-client = MongoClient(os.getenv("MONGO_URI"))
-db = client["authndb"]
-users = db["users"]
+# Bump SYSTEM_PROMPT_VERSION whenever SYSTEM_PROMPT changes so cached answers are retired
+SYSTEM_PROMPT_VERSION = "1"
+SYSTEM_PROMPT = (
+    "You are a scheduling assistant. Given the user's natural language request, "
+    "return ONLY a JSON array of schedule objects with the fields: "
+    "commitment, day, start_time (24hr), end_time (24hr), location. "
+    "No extra explanation, just valid JSON.\n\nUser input: "
+)
+
+# Prompt -> parsed entries cache; LLM_CACHE_MONGO=1 adds the shared Mongo tier
+prompt_cache = PromptCache(
+    version=SYSTEM_PROMPT_VERSION,
+    maxsize=int(os.getenv("LLM_CACHE_SIZE", "1024")),
+    ttl=int(os.getenv("LLM_CACHE_TTL", str(7 * 24 * 3600))),
+    collection="llm_cache" if os.getenv("LLM_CACHE_MONGO") == "1" else None
+)
+
+# Spaces out model calls so concurrent requests stay under the API rate limit
+class RateLimiter:
+    def __init__(self, rate):
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next = 0.0
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next - now
+            self._next = max(now, self._next) + self.interval
+        if wait > 0:
+            time.sleep(wait)
+
+rate_limiter = RateLimiter(float(os.getenv("LLM_RATE_LIMIT", "5")))  # calls per second
+BATCH_CONCURRENCY = int(os.getenv("LLM_BATCH_CONCURRENCY", "4"))
 
 # Send a prompt to Gemini and return the plain JSON string response
 def get_llm_response(prompt):
     try:
-        full_prompt = (
-            "You are a scheduling assistant. Given the user's natural language request, "
-            "return ONLY a JSON array of schedule objects with the fields: "
-            "commitment, day, start_time (24hr), end_time (24hr), location. "
-            "No extra explanation, just valid JSON.\n\nUser input: " + prompt
-        )
+        rate_limiter.acquire()
+        full_prompt = SYSTEM_PROMPT + prompt
         response = model.generate_content(full_prompt)
         return response.text
     except Exception as e:
         return f"Error generating response: {str(e)}"
 
+# Stream the model's response text chunk by chunk as it is generated
+def stream_llm_response(prompt):
+    rate_limiter.acquire()
+    response = model.generate_content(SYSTEM_PROMPT + prompt, stream=True)
+    for chunk in response:
+        if chunk.text:
+            yield chunk.text
+
 # Parse LLM output into a Python dictionary list (schedule entries)
 def parse_schedule_from_llm_response(response_text):
+    text = response_text.strip()
+    if text.startswith("```"):  # model sometimes wraps the JSON in a code fence
+        text = text.strip("`").removeprefix("json").strip()
     try:
-        return json.loads(response_text)
+        return json.loads(text)
     except json.JSONDecodeError:
         return []
 
-# Core: Take user prompt ➔ get LLM schedule JSON ➔ update DB
+# Translate a prompt into schedule entries, answering from the cache when possible.
+# Returns (entries, response text to log).
+def get_schedule_entries(prompt):
+    cached = prompt_cache.get(prompt)
+    if cached is not None:
+        return cached, json.dumps(cached)
 
-def update_schedule_from_prompt(netid, prompt):
     llm_response = get_llm_response(prompt)
     parsed_schedule = parse_schedule_from_llm_response(llm_response)
+    prompt_cache.put(prompt, parsed_schedule)  # ignored unless it validates
+    return parsed_schedule, llm_response
+
+# Core: Take user prompt ➔ get LLM schedule JSON ➔ update DB
+
+def update_schedule_from_prompt(netid, prompt):
+    parsed_schedule, llm_response = get_schedule_entries(prompt)
 
     update_prompt_history(netid, prompt, llm_response)
     updated_ics = merge_schedule(netid, parsed_schedule)
     return updated_ics
+
+# Streaming: yields ("token", text) while the model generates, then ("schedule", ics)
+# once the entries are merged, or ("error", message) if generation fails
+
+def stream_schedule_update(netid, prompt):
+    cached = prompt_cache.get(prompt)
+    if cached is not None:
+        llm_response = json.dumps(cached)
+        yield "token", llm_response
+        parsed_schedule = cached
+    else:
+        chunks = []
+        try:
+            for text in stream_llm_response(prompt):
+                chunks.append(text)
+                yield "token", text
+        except Exception as e:
+            yield "error", f"Error generating response: {str(e)}"
+            return
+        llm_response = "".join(chunks)
+        parsed_schedule = parse_schedule_from_llm_response(llm_response)
+        prompt_cache.put(prompt, parsed_schedule)
+
+    update_prompt_history(netid, prompt, llm_response)
+    yield "schedule", merge_schedule(netid, parsed_schedule)
+
+# Batch: translate several prompts concurrently, then merge and log them in one write each
+
+def update_schedule_from_prompts(netid, prompts):
+    with ThreadPoolExecutor(max_workers=max(1, min(len(prompts), BATCH_CONCURRENCY))) as pool:
+        results = list(pool.map(get_schedule_entries, prompts))
+
+    # Entries are merged in prompt order, so later prompts win conflicts
+    update_prompt_history_many(netid, [(prompt, llm_response) for prompt, (_, llm_response) in zip(prompts, results)])
+    updated_ics = merge_schedule(netid, [entry for entries, _ in results for entry in entries])
+    return updated_ics
@@ -0,0 +1,5 @@
+# One-off migration: convert ICS-string schedules into structured event lists
+from schedule_utils import migrate_schedule_documents
+
+migrated = migrate_schedule_documents(log=True)
+print(f"✅ Migrated {migrated} user document(s).")
@@ -0,0 +1,295 @@
+# schedule_events.py
+# Canonical structured representation for schedule events.
+#
+# Schedules are stored in MongoDB as lists of event subdocuments instead of
+# serialized ICS strings. An event looks like:
+#
+#   {
+#       "id": "3f9c1e0a7b2d",          # stable id used by $pull edits
+#       "title": "Gym",
+#       "day": "Monday",               # weekday name
+#       "start": 420,                  # minutes after midnight
+#       "end": 480,
+#       "location": "",
+#       "description": "",
+#       "date": None,                  # "YYYY-MM-DD" for one-off events
+#       "recurrence": None,            # or {"freq": "WEEKLY", "starts": "YYYY-MM-DD",
+#                                      #      "until": "YYYY-MM-DD", "exdates": [...],
+#                                      #      "interval": 2}  (interval only when > 1)
+#       "source": "llm"                # llm | webreg | ics | manual
+#   }
+#
+# Events without a date or recurrence repeat weekly with no end, which is how
+# the LLM assistant's entries ("gym MWF 7-8am") are meant.
+
+import uuid
+from datetime import date, timedelta
+from ics import Calendar, Event
+from ics.grammar.parse import ContentLine
+
+from schedule_index import to_minutes
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+TZID = "America/New_York"
+
+VTIMEZONE_BLOCK = (
+    "BEGIN:VTIMEZONE\n"
+    "TZID:America/New_York\n"
+    "X-LIC-LOCATION:America/New_York\n"
+    "BEGIN:DAYLIGHT\n"
+    "TZOFFSETFROM:-0500\n"
+    "TZOFFSETTO:-0400\n"
+    "TZNAME:EDT\n"
+    "DTSTART:19700308T020000\n"
+    "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU\n"
+    "END:DAYLIGHT\n"
+    "BEGIN:STANDARD\n"
+    "TZOFFSETFROM:-0400\n"
+    "TZOFFSETTO:-0500\n"
+    "TZNAME:EST\n"
+    "DTSTART:19701101T020000\n"
+    "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU\n"
+    "END:STANDARD\n"
+    "END:VTIMEZONE\n"
+)
+
+
+def new_event_id():
+    return uuid.uuid4().hex[:12]
+
+
+def make_event(title, day, start, end, location="", description="",
+               date=None, recurrence=None, source="manual"):
+    """Builds a canonical event dictionary."""
+    return {
+        "id": new_event_id(),
+        "title": title,
+        "day": day,
+        "start": start,
+        "end": end,
+        "location": location or "",
+        "description": description or "",
+        "date": date,
+        "recurrence": recurrence,
+        "source": source
+    }
+
+
+def is_event(item):
+    return isinstance(item, dict) and "start" in item and "end" in item
+
+
+def normalize_day(day):
+    """
+    Resolves an entry's day into (weekday name, one-off date or None).
+
+    Accepts weekday names in any case, three-letter abbreviations, or an
+    ISO date ("2025-09-03").
+    """
+    day = str(day).strip()
+    try:
+        d = date.fromisoformat(day)
+        return DAYS[d.weekday()], d.isoformat()
+    except ValueError:
+        pass
+    for name in DAYS:
+        if day.lower() in (name.lower(), name[:3].lower()):
+            return name, None
+    raise ValueError(f"Unrecognized day: {day}")
+
+
+def _text(value, name):
+    if value is None:
+        return ""
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string")
+    return value
+
+
+def _iso_date(value, name):
+    if value is None:
+        return None
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a YYYY-MM-DD string")
+    return date.fromisoformat(value).isoformat()  # ValueError if malformed
+
+
+def _time_span(start, end):
+    for name, value in (("start", start), ("end", end)):
+        if isinstance(value, bool) or not isinstance(value, int):
+            raise ValueError(f"{name} must be an integer number of minutes")
+    if not 0 <= start <= end <= 24 * 60:
+        raise ValueError(f"start/end out of range: {start}-{end}")
+    return start, end
+
+
+def _recurrence(value):
+    if value is None:
+        return None
+    if not isinstance(value, dict) or value.get("freq", "WEEKLY") != "WEEKLY":
+        raise ValueError("recurrence must be a weekly rule")
+    if not value.get("starts"):
+        raise ValueError("recurrence.starts is required (YYYY-MM-DD)")
+    exdates = value.get("exdates") or []
+    if not isinstance(exdates, list):
+        raise ValueError("recurrence.exdates must be a list")
+    recurrence = {
+        "freq": "WEEKLY",
+        "starts": _iso_date(value["starts"], "recurrence.starts"),
+        "until": _iso_date(value.get("until"), "recurrence.until"),
+        "exdates": sorted(_iso_date(d, "recurrence.exdates") for d in exdates)
+    }
+    interval = value.get("interval", 1)
+    if isinstance(interval, bool) or not isinstance(interval, int) or interval < 1:
+        raise ValueError("recurrence.interval must be a positive integer")
+    if interval > 1:
+        recurrence["interval"] = interval
+    return recurrence
+
+
+def coerce_event(item, source="manual"):
+    """
+    Rebuilds a client-supplied canonical event through make_event, checking
+    every field's type, so nothing malformed reaches MongoDB. Keeps the
+    event's id (and source) when they are valid.
+
+    Raises:
+        ValueError: If a field is missing or has the wrong type or range.
+    """
+    if not isinstance(item.get("day"), str):
+        raise ValueError("day must be a weekday name")
+    day, one_off = normalize_day(item["day"])
+    one_off = _iso_date(item.get("date"), "date") or one_off
+    if one_off:
+        day = DAYS[date.fromisoformat(one_off).weekday()]
+    start, end = _time_span(item["start"], item["end"])
+
+    event = make_event(
+        title=_text(item.get("title"), "title") or "Untitled",
+        day=day,
+        start=start,
+        end=end,
+        location=_text(item.get("location"), "location"),
+        description=_text(item.get("description"), "description"),
+        date=one_off,
+        recurrence=None if one_off else _recurrence(item.get("recurrence")),
+        source=item["source"] if isinstance(item.get("source"), str) and item["source"] else source
+    )
+    if isinstance(item.get("id"), str) and item["id"]:
+        event["id"] = item["id"]
+    return event
+
+
+def entry_to_event(entry, source="llm"):
+    """
+    Converts an assistant entry ({commitment, day, start_time, end_time,
+    location}) into a canonical event. Canonical events are re-validated
+    through coerce_event.
+
+    Raises:
+        ValueError: If the entry is malformed.
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("event must be an object")
+    if is_event(entry):
+        return coerce_event(entry, source)
+    for name in ("day", "start_time", "end_time"):
+        if not isinstance(entry.get(name), str):
+            raise ValueError(f"{name} must be a string")
+    day, one_off = normalize_day(entry["day"])
+    start, end = _time_span(to_minutes(entry["start_time"]), to_minutes(entry["end_time"]))
+    return make_event(
+        title=_text(entry.get("commitment"), "commitment") or "Untitled",
+        day=day,
+        start=start,
+        end=end,
+        location=_text(entry.get("location"), "location"),
+        date=one_off,
+        source=source
+    )
+
+
+def event_to_entry(event):
+    """Converts a canonical event back into the assistant's entry format."""
+    return {
+        "commitment": event["title"],
+        "day": event["date"] or event["day"],
+        "start_time": f"{event['start'] // 60:02d}:{event['start'] % 60:02d}",
+        "end_time": f"{event['end'] // 60:02d}:{event['end'] % 60:02d}",
+        "location": event["location"]
+    }
+
+
+def _next_weekday(start_date, weekday):
+    return start_date + timedelta(days=(weekday - start_date.weekday() + 7) % 7)
+
+
+def _local(d, minutes):
+    return f"{d.strftime('%Y%m%d')}T{minutes // 60:02d}{minutes % 60:02d}00"
+
+
+def render_ics(events, today=None):
+    """
+    Renders canonical events as an ICS calendar string.
+
+    One-off events are written on their date; recurring events get a weekly
+    RRULE (with UNTIL and EXDATEs when known); undated events repeat weekly
+    starting from their next occurrence after `today`.
+    """
+    today = today or date.today()
+    calendar = Calendar()
+    tz = {"TZID": [TZID]}
+
+    for event in events:
+        weekday = DAYS.index(event["day"])
+        recurrence = event.get("recurrence")
+        rrule = None
+
+        if event.get("date"):
+            first = date.fromisoformat(event["date"])
+        elif recurrence:
+            # Documents stored before starts was required fall back to today, as occurs_on does
+            starts = recurrence.get("starts")
+            first = _next_weekday(date.fromisoformat(starts) if starts else today, weekday)
+            rrule = f"FREQ={recurrence.get('freq', 'WEEKLY')}"
+            if recurrence.get("interval", 1) > 1:
+                rrule += f";INTERVAL={recurrence['interval']}"
+            if recurrence.get("until"):
+                rrule += f";UNTIL={date.fromisoformat(recurrence['until']).strftime('%Y%m%d')}T235959"
+        else:
+            first = _next_weekday(today, weekday)
+            rrule = "FREQ=WEEKLY"
+
+        e = Event()
+        e.name = event["title"]
+        e.location = event.get("location", "")
+        e.description = event.get("description", "")
+        e.extra.append(ContentLine(name="DTSTART", params=tz, value=_local(first, event["start"])))
+        e.extra.append(ContentLine(name="DTEND", params=tz, value=_local(first, event["end"])))
+        if rrule:
+            e.extra.append(ContentLine(name="RRULE", value=rrule))
+        if recurrence and recurrence.get("exdates"):
+            values = ",".join(_local(date.fromisoformat(d), event["start"]) for d in recurrence["exdates"])
+            e.extra.append(ContentLine(name="EXDATE", params=tz, value=values))
+        calendar.events.add(e)
+
+    body = calendar.serialize()
+    if "BEGIN:VEVENT" not in body:
+        return body
+    return body.replace("BEGIN:VEVENT", f"{VTIMEZONE_BLOCK}BEGIN:VEVENT", 1)
+
+
+def occurs_together(a, b):
+    """
+    Whether two events on the same weekday can actually coincide, i.e. their
+    one-off dates and recurrence ranges overlap.
+    """
+    def span(event):
+        if event.get("date"):
+            return event["date"], event["date"]
+        recurrence = event.get("recurrence") or {}
+        return recurrence.get("starts") or "0000-00-00", recurrence.get("until") or "9999-99-99"
+
+    a_start, a_end = span(a)
+    b_start, b_end = span(b)
+    return a_start <= b_end and b_start <= a_end
@@ -0,0 +1,115 @@
+# schedule_index.py
+# Per-day interval index used to resolve schedule conflicts without
+# rescanning the whole schedule for every incoming entry.
+
+from bisect import bisect_left, insort
+
+
+# 🕒 Convert an "HH:MM" (24hr) string into minutes after midnight
+def to_minutes(hhmm):
+    hours, minutes = hhmm.strip().split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+# 🕒 Start/end minutes for a canonical event or an "HH:MM" assistant entry
+def entry_bounds(entry):
+    if "start" in entry:
+        return entry["start"], entry["end"]
+    return to_minutes(entry["start_time"]), to_minutes(entry["end_time"])
+
+
+class ScheduleIndex:
+    """
+    Interval index over schedule entries, keyed by day.
+
+    Each day keeps its intervals in a list sorted by start minute, along with
+    the longest interval length seen on that day. An overlap query for
+    [start, end) only has to look at intervals starting in
+    (start - longest, end), which bisect finds in O(log n), so finding the k
+    conflicts of a new entry costs O(log n + k) instead of a full scan.
+
+    Start and end times are converted to integer minutes once, when an entry
+    is added, so queries never re-parse time strings.
+
+    Args:
+        entries: Initial entries (canonical events or assistant entries).
+        coincide: Optional predicate (a, b) -> bool used to drop same-day
+            overlaps that can never happen at once, e.g. one-off events on
+            different dates.
+    """
+
+    def __init__(self, entries=(), coincide=None):
+        self._coincide = coincide
+        self._days = {}     # day -> sorted list of (start, end, seq)
+        self._longest = {}  # day -> longest interval length on that day
+        self._entries = {}  # seq -> entry
+        self._seq = 0       # insertion counter; keeps output order stable
+        for entry in entries:
+            self.add(entry)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __iter__(self):
+        return iter(self.entries())
+
+    def entries(self):
+        """Returns the indexed entries in insertion order."""
+        return [self._entries[seq] for seq in sorted(self._entries)]
+
+    def add(self, entry):
+        """Indexes an entry without checking for conflicts."""
+        start, end = entry_bounds(entry)
+        day = entry["day"]
+        seq = self._seq
+        self._seq += 1
+
+        insort(self._days.setdefault(day, []), (start, end, seq))
+        self._longest[day] = max(self._longest.get(day, 0), end - start)
+        self._entries[seq] = entry
+        return seq
+
+    def overlapping(self, day, start, end):
+        """Returns the (start, end, seq) intervals on `day` overlapping [start, end)."""
+        intervals = self._days.get(day)
+        if not intervals:
+            return []
+
+        lo = bisect_left(intervals, (start - self._longest[day],))
+        hits = []
+        for i in range(lo, len(intervals)):
+            s, e, seq = intervals[i]
+            if s >= end:
+                break
+            if e > start:
+                hits.append((s, e, seq))
+        return hits
+
+    def _conflicting(self, entry):
+        start, end = entry_bounds(entry)
+        hits = self.overlapping(entry["day"], start, end)
+        if self._coincide:
+            hits = [hit for hit in hits if self._coincide(self._entries[hit[2]], entry)]
+        return hits
+
+    def conflicts(self, entry):
+        """Returns the indexed entries that conflict with `entry`."""
+        return [self._entries[seq] for _, _, seq in self._conflicting(entry)]
+
+    def insert(self, entry):
+        """
+        Adds an entry, evicting every indexed entry that conflicts with it.
+
+        Returns:
+            list: The evicted entries.
+        """
+        evicted = []
+        hits = self._conflicting(entry)
+        if hits:
+            intervals = self._days[entry["day"]]
+            for hit in hits:
+                del intervals[bisect_left(intervals, hit)]
+                evicted.append(self._entries.pop(hit[2]))
+
+        self.add(entry)
+        return evicted
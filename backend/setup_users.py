@@ -1,13 +1,6 @@
-from pymongo import MongoClient
 from werkzeug.security import generate_password_hash
-from dotenv import load_dotenv
-import os
 
-load_dotenv()
-
-client = MongoClient(os.getenv("MONGO_URI"))
-db = client["authndb"]
-users = db["users"]
+from db import users
 
 netid = "am3606"
 password = "test123"
@@ -15,10 +8,10 @@ password = "test123"
 user_doc = {
     "netid": netid,
     "password_hash": generate_password_hash(password),
-    "current_schedule": "",         # only ONE .ics string
-    "past_schedules": [],           # list of .ics strings
+    "current_schedule": [],         # list of event subdocuments
+    "past_schedules": [],           # list of {archived_at, events}
     "prompt_history": [],           # list of prompt → response
-    "friends": {}                   # netid → ics schedule mapping
+    "friends": {}                   # netid → shared schedule events
 }
 
 existing = users.find_one({"netid": netid})
@@ -0,0 +1,140 @@
+"""
+Benchmark: academic calendar table parsing.
+
+Compares the original process_semester (a fresh scan of every row for each
+label, semester and academic year) with the label-to-row index, on the
+saved page in scrapers/fixtures/ and on a widened copy with more years and
+filler rows. Both implementations must produce the same calendar.
+
+Usage:
+    python benchmarks/bench_academic_calendar.py [years] [filler_rows] [repeats]
+"""
+import os
+import re
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from bs4 import BeautifulSoup
+from scrapers.academic_calendar import parse_academic_calendar_html, parse_date, parse_recess
+from scrapers.parsing import HTML_PARSER
+
+FIXTURE = os.path.join(ROOT, "scrapers", "fixtures", "academic_calendar.html")
+
+SEMESTER_CONFIGS = [
+    ("Fall {}", "Fall Semester Begins", "Regular Classes End", {"name": "Thanksgiving Recess"}),
+    ("Winter {}", "Winter Session Begins", "Winter Session Ends", None),
+    ("Spring {}", "Spring Semester Begins", "Regular Classes End", {"name": "Spring Recess Begins"}),
+    ("Summer {}", "Summer Session Begins", "Summer Session Ends", None)
+]
+
+
+def legacy_process_semester(rows, academic_years, i, semester_key, start_key, end_key, recess_info=None):
+    """process_semester as it was before the row index."""
+    start_row = next(r for r in rows if r.find("td").find("strong", string=start_key))
+    start_index = rows.index(start_row)
+    if end_key == "Regular Classes End":
+        end_row = next((r for r in rows[start_index + 1:] if r.find("td").find("strong", string=end_key)), None)
+        if end_row is None:
+            raise ValueError(f"No 'Regular Classes End' row found after '{start_key}' for {semester_key}")
+    else:
+        end_row = next(r for r in rows if r.find("td").find("strong", string=end_key))
+    start_str = start_row.find_all("td")[i + 1].text.strip()
+    end_str = end_row.find_all("td")[i + 1].text.strip()
+    if not (start_str and end_str):
+        return None
+    data = {"start": parse_date(start_str), "end": parse_date(end_str), "recesses": []}
+    if recess_info and recess_info["name"] == "Thanksgiving Recess":
+        recess_row = next(r for r in rows if r.find("td").find("strong", string=recess_info["name"]))
+        recess_str = recess_row.find_all("td")[i + 1].text.strip()
+        if recess_str:
+            recess_start, recess_end = parse_recess(recess_str)
+            data["recesses"].append({"name": recess_info["name"], "start": recess_start, "end": recess_end})
+    elif recess_info and recess_info["name"] == "Spring Recess Begins":
+        recess_start_row = next(r for r in rows if r.find("td").find("strong", string="Spring Recess Begins"))
+        recess_end_row = next(r for r in rows if r.find("td").find("strong", string="Spring Recess Ends"))
+        recess_start_str = recess_start_row.find_all("td")[i + 1].text.strip()
+        recess_end_str = recess_end_row.find_all("td")[i + 1].text.strip()
+        if recess_start_str and recess_end_str:
+            data["recesses"].append({
+                "name": "Spring Recess",
+                "start": parse_date(recess_start_str),
+                "end": parse_date(recess_end_str)
+            })
+    return data
+
+
+def legacy_parse(html):
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", class_="pretty-table responsive-enabled")
+    rows = table.find("tbody").find_all("tr")
+    academic_years = [th.text.strip() for th in table.find("thead").find("tr").find_all("th")[1:]]
+    calendar_data = {}
+    for i, year in enumerate(academic_years):
+        fall_year, spring_year = map(int, year.split("-"))
+        for name_template, start_key, end_key, recess_info in SEMESTER_CONFIGS:
+            year_to_use = fall_year if "Fall" in name_template else spring_year
+            semester_key = name_template.format(year_to_use)
+            data = legacy_process_semester(rows, academic_years, i, semester_key, start_key, end_key, recess_info)
+            if data:
+                calendar_data[semester_key] = data
+    return calendar_data
+
+
+def widen(html, years, filler_rows):
+    """Repeats the fixture's first year column `years` times and adds unlabelled-event filler rows."""
+    soup = BeautifulSoup(html, "html.parser")
+    table = soup.find("table", class_="pretty-table responsive-enabled")
+    header = table.find("thead").find("tr")
+    first_year = int(header.find_all("th")[1].text.split("-")[0])
+    for th in header.find_all("th")[1:]:
+        th.decompose()
+    for k in range(years):
+        th = soup.new_tag("th")
+        th.string = f"{first_year + k}-{first_year + k + 1}"
+        header.append(th)
+
+    tbody = table.find("tbody")
+    for row in tbody.find_all("tr"):
+        cells = row.find_all("td")
+        template = cells[1].text
+        for cell in cells[1:]:
+            cell.decompose()
+        for k in range(years):
+            td = soup.new_tag("td")
+            td.string = re.sub(r"\d{4}", lambda m: str(int(m.group()) + k), template)
+            row.append(td)
+    for n in range(filler_rows):
+        row = soup.new_tag("tr")
+        label = soup.new_tag("td")
+        strong = soup.new_tag("strong")
+        strong.string = f"Campus Event {n}"
+        label.append(strong)
+        row.append(label)
+        for k in range(years):
+            row.append(soup.new_tag("td"))
+        tbody.insert(0, row)  # ahead of the real rows, so every scan walks past them
+    return str(soup)
+
+
+def bench(name, html, repeats):
+    expected = legacy_parse(html)
+    assert parse_academic_calendar_html(html) == expected, f"{name}: calendars differ"
+    legacy_s = min(timeit.repeat(lambda: legacy_parse(html), number=1, repeat=repeats))
+    indexed_s = min(timeit.repeat(lambda: parse_academic_calendar_html(html), number=1, repeat=repeats))
+    print(f"{name:>28}: legacy {legacy_s * 1000:8.1f} ms | indexed {indexed_s * 1000:7.1f} ms | "
+          f"{legacy_s / indexed_s:5.1f}x  ({len(expected)} semesters)")
+
+
+if __name__ == "__main__":
+    years = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    filler_rows = int(sys.argv[2]) if len(sys.argv) > 2 else 100
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+
+    with open(FIXTURE) as f:
+        html = f.read()
+    print(f"HTML parser: {HTML_PARSER} (legacy: html.parser)")
+    bench("saved page", html, repeats)
+    bench(f"{years} years + {filler_rows} filler rows", widen(html, years, filler_rows), repeats)
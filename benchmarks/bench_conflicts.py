@@ -0,0 +1,72 @@
+"""
+Benchmark: conflict resolution during merge_schedule.
+
+Compares the original list-comprehension path (remove_conflicts_from_schedule
+once per incoming entry) with the per-day ScheduleIndex on batches of random
+LLM/WebReg-sized entries.
+
+Usage:
+    python benchmarks/bench_conflicts.py [existing] [incoming] [repeats]
+"""
+import os
+import random
+import sys
+import timeit
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from schedule_index import ScheduleIndex
+from schedule_utils import remove_conflicts_from_schedule
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def random_entries(n, seed):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        start = rng.randrange(7 * 60, 21 * 60, 5)
+        end = start + rng.choice([30, 50, 60, 80, 90, 180])
+        entries.append({
+            "commitment": f"Event {i}",
+            "day": rng.choice(DAYS),
+            "start_time": f"{start // 60:02d}:{start % 60:02d}",
+            "end_time": f"{end // 60:02d}:{end % 60:02d}",
+            "location": ""
+        })
+    return entries
+
+
+def merge_with_list(existing, incoming):
+    schedule = list(existing)
+    for new_entry in incoming:
+        schedule = remove_conflicts_from_schedule(schedule, new_entry)
+        schedule.append(new_entry)
+    return schedule
+
+
+def merge_with_index(existing, incoming):
+    index = ScheduleIndex(existing)
+    for new_entry in incoming:
+        index.insert(new_entry)
+    return index.entries()
+
+
+def main():
+    n_existing = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    n_incoming = int(sys.argv[2]) if len(sys.argv) > 2 else 300
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 20
+
+    existing = random_entries(n_existing, seed=1)
+    incoming = random_entries(n_incoming, seed=2)
+
+    # Both paths must agree on the merged schedule
+    assert merge_with_list(existing, incoming) == merge_with_index(existing, incoming)
+
+    for name, fn in [("list comprehension", merge_with_list), ("ScheduleIndex", merge_with_index)]:
+        best = min(timeit.repeat(lambda: fn(existing, incoming), number=1, repeat=repeats))
+        print(f"{name:>20}: {best * 1000:8.3f} ms  ({n_existing} existing + {n_incoming} incoming)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""
+Benchmark: conflict checks and free-time search on weekly schedules.
+
+Compares pairwise checks with the original "HH:MM" strptime comparison
+(legacy_is_conflict) and a minute-by-minute free-time scan against the
+FreeBusy bitmap (7 x 288 five-minute slots in one int).
+
+Usage:
+    python benchmarks/bench_freebusy.py [events] [candidates] [repeats] [group size]
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import datetime
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from freebusy import FreeBusy, group_availability
+from schedule_events import DAYS
+
+WINDOW = (8 * 60, 22 * 60)
+MIN_MINUTES = 30
+
+
+def random_entries(n, seed):
+    rng = random.Random(seed)
+    entries = []
+    for i in range(n):
+        start = rng.randrange(7 * 60, 21 * 60, 5)
+        end = start + rng.choice([30, 50, 60, 80, 90, 180])
+        entries.append({
+            "day": rng.choice(DAYS),
+            "start": start,
+            "end": end,
+            "start_time": f"{start // 60:02d}:{start % 60:02d}",
+            "end_time": f"{end // 60:02d}:{end % 60:02d}"
+        })
+    return entries
+
+
+def legacy_is_conflict(event1, event2):
+    if event1["day"] != event2["day"]:
+        return False
+    s1 = datetime.strptime(event1["start_time"], "%H:%M")
+    e1 = datetime.strptime(event1["end_time"], "%H:%M")
+    s2 = datetime.strptime(event2["start_time"], "%H:%M")
+    e2 = datetime.strptime(event2["end_time"], "%H:%M")
+    return s1 < e2 and s2 < e1
+
+
+def pairwise_conflicts(schedule, candidates):
+    return [any(legacy_is_conflict(event, c) for event in schedule) for c in candidates]
+
+
+def bitmap_conflicts(schedule, candidates):
+    busy = FreeBusy.from_events(schedule)
+    return [busy.conflicts(c) for c in candidates]
+
+
+def scan_free_blocks(schedule):
+    blocks = []
+    for day in DAYS:
+        busy = [False] * (24 * 60)
+        for event in schedule:
+            if event["day"] == day:
+                for minute in range(event["start"], min(event["end"], 24 * 60)):
+                    busy[minute] = True
+        run = None
+        for minute in range(WINDOW[0], WINDOW[1] + 1):
+            if minute < WINDOW[1] and not busy[minute]:
+                run = minute if run is None else run
+            elif run is not None:
+                if minute - run >= MIN_MINUTES:
+                    blocks.append({"day": day, "start": run, "end": minute})
+                run = None
+    return blocks
+
+
+def bitmap_free_blocks(schedule):
+    return FreeBusy.from_events(schedule).free_blocks(MIN_MINUTES, *WINDOW)
+
+
+def naive_group_ranking(schedules, duration=60, limit=10):
+    # Every candidate start checked against every member's events
+    candidates = []
+    for day in DAYS:
+        for start in range(WINDOW[0], WINDOW[1] - duration + 1, 15):
+            meeting = {"day": day, "start_time": f"{start // 60:02d}:{start % 60:02d}",
+                       "end_time": f"{(start + duration) // 60:02d}:{(start + duration) % 60:02d}"}
+            available = sum(not any(legacy_is_conflict(e, meeting) for e in events) for events in schedules.values())
+            candidates.append((-available, DAYS.index(day), start))
+    return [(day, start, -available) for available, day, start in sorted(candidates)[:limit]]
+
+
+def bitmap_group_ranking(schedules, duration=60, limit=10):
+    members = {name: FreeBusy.from_events(events) for name, events in schedules.items()}
+    ranked = group_availability(members, duration, *WINDOW, limit=limit)["candidates"]
+    return [(DAYS.index(c["day"]), c["start"], c["available"]) for c in ranked]
+
+
+def main():
+    n_events = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    n_candidates = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    repeats = int(sys.argv[3]) if len(sys.argv) > 3 else 10
+    group_size = int(sys.argv[4]) if len(sys.argv) > 4 else 50
+
+    schedule = random_entries(n_events, seed=1)
+    candidates = random_entries(n_candidates, seed=2)
+
+    # Times are multiples of five minutes, so both paths must agree exactly
+    assert pairwise_conflicts(schedule, candidates) == bitmap_conflicts(schedule, candidates)
+    assert scan_free_blocks(schedule) == bitmap_free_blocks(schedule)
+
+    schedules = {f"user{i}": random_entries(n_events // 2, seed=10 + i) for i in range(group_size)}
+    assert naive_group_ranking(schedules) == bitmap_group_ranking(schedules)
+
+    runs = [
+        ("pairwise strptime", lambda: pairwise_conflicts(schedule, candidates), f"conflicts ({n_events} events, {n_candidates} candidates)"),
+        ("FreeBusy", lambda: bitmap_conflicts(schedule, candidates), f"conflicts ({n_events} events, {n_candidates} candidates)"),
+        ("minute scan", lambda: scan_free_blocks(schedule), f"free blocks ({n_events} events)"),
+        ("FreeBusy", lambda: bitmap_free_blocks(schedule), f"free blocks ({n_events} events)"),
+        ("pairwise strptime", lambda: naive_group_ranking(schedules), f"group ranking ({group_size} users)"),
+        ("group_availability", lambda: bitmap_group_ranking(schedules), f"group ranking ({group_size} users)"),
+    ]
+    for name, fn, what in runs:
+        best = min(timeit.repeat(fn, number=1, repeat=repeats))
+        print(f"{name:>20}: {best * 1000:8.3f} ms  {what}")
+
+
+if __name__ == "__main__":
+    main()
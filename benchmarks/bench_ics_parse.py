@@ -0,0 +1,140 @@
+"""
+Benchmark: parsing stored ICS schedules and querying them.
+
+Compares the original ics-library parser (Calendar(...).events, kept here as
+legacy_events_from_ics) with ics_parser.parse_ics on a rendered
+semester-long calendar, then times "what is on this date between t1 and t2"
+through ScheduleQuery against expanding every recurrence up front.
+
+Usage:
+    python benchmarks/bench_ics_parse.py [events] [repeats]
+"""
+import os
+import random
+import sys
+import timeit
+from datetime import date, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from ics import Calendar
+
+from ics_parser import ScheduleQuery, occurs_on, parse_ics
+from schedule_events import DAYS, make_event, render_ics
+
+SEMESTER_START = date(2025, 9, 2)
+SEMESTER_END = date(2025, 12, 10)
+RECESS = [date(2025, 11, 26) + timedelta(days=i) for i in range(5)]
+
+
+def _ics_date(value):
+    return value[:4] + "-" + value[4:6] + "-" + value[6:8]
+
+
+def legacy_events_from_ics(ics_string, source="ics"):
+    # The parser schedule_events.py used before ics_parser.py
+    events = []
+    for e in Calendar(ics_string).events:
+        begin = e.begin.datetime
+        end = e.end.datetime if e.end else begin
+
+        recurrence = None
+        for line in e.extra:
+            if line.name == "RRULE":
+                rule = dict(part.split("=", 1) for part in line.value.split(";") if "=" in part)
+                recurrence = recurrence or {"exdates": []}
+                recurrence.update({
+                    "freq": rule.get("FREQ", "WEEKLY"),
+                    "starts": begin.date().isoformat(),
+                    "until": _ics_date(rule["UNTIL"]) if "UNTIL" in rule else None
+                })
+            elif line.name == "EXDATE":
+                recurrence = recurrence or {"exdates": []}
+                recurrence["exdates"].extend(_ics_date(v) for v in line.value.split(",") if v)
+        if recurrence and "freq" not in recurrence:
+            recurrence = None
+
+        events.append(make_event(
+            title=e.name or "Untitled",
+            day=DAYS[begin.weekday()],
+            start=begin.hour * 60 + begin.minute,
+            end=end.hour * 60 + end.minute,
+            location=e.location or "",
+            description=e.description or "",
+            date=None if recurrence else begin.date().isoformat(),
+            recurrence=recurrence,
+            source=source
+        ))
+    return events
+
+
+def semester_events(n, seed=1):
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        day = rng.choice(DAYS[:5])
+        start = rng.randrange(8 * 60, 21 * 60, 5)
+        weekday = DAYS.index(day)
+        starts = SEMESTER_START + timedelta(days=(weekday - SEMESTER_START.weekday()) % 7)
+        events.append(make_event(
+            title=f"Course {i}, Section {rng.randrange(1, 20):02d}",
+            day=day, start=start, end=start + rng.choice([55, 80, 180]),
+            location=f"Room {rng.randrange(100, 400)}",
+            recurrence={
+                "freq": "WEEKLY",
+                "starts": starts.isoformat(),
+                "until": SEMESTER_END.isoformat(),
+                "exdates": [d.isoformat() for d in RECESS if d.weekday() == weekday]
+            },
+            source="webreg"
+        ))
+    return events
+
+
+def shape(events):
+    # Fields both parsers agree on (ids are random, descriptions differ in whitespace)
+    return sorted((e["title"], e["day"], e["start"], e["end"], e["location"],
+                   (e["recurrence"] or {}).get("until"), tuple((e["recurrence"] or {}).get("exdates", ())))
+                  for e in events)
+
+
+def expanded_on(events, on_date, start, end):
+    # Materialize every occurrence for the semester, then filter
+    occurrences = []
+    for event in events:
+        d = SEMESTER_START
+        while d <= SEMESTER_END:
+            if occurs_on(event, d):
+                occurrences.append((d, event))
+            d += timedelta(days=1)
+    return sorted((e for d, e in occurrences if d == on_date and e["start"] < end and start < e["end"]),
+                  key=lambda e: (e["start"], e["end"]))
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    ics_string = render_ics(semester_events(n), today=SEMESTER_START)
+    print(f"calendar: {n} weekly events, {len(ics_string) / 1024:.1f} KiB")
+
+    parsed = parse_ics(ics_string)
+    assert shape(parsed) == shape(legacy_events_from_ics(ics_string))
+
+    for name, fn in [("ics library", legacy_events_from_ics), ("parse_ics", parse_ics)]:
+        best = min(timeit.repeat(lambda: fn(ics_string), number=1, repeat=repeats))
+        print(f"{name:>20}: {best * 1000:8.3f} ms  parse")
+
+    query = ScheduleQuery(parsed)
+    on_date, start, end = date(2025, 10, 8), 10 * 60, 14 * 60
+    assert [e["id"] for e in query.on(on_date, start, end)] == \
+        [e["id"] for e in expanded_on(parsed, on_date, start, end)]
+
+    for name, fn in [("expand then filter", lambda: expanded_on(parsed, on_date, start, end)),
+                     ("ScheduleQuery.on", lambda: query.on(on_date, start, end))]:
+        best = min(timeit.repeat(fn, number=1, repeat=repeats))
+        print(f"{name:>20}: {best * 1000:8.3f} ms  events on {on_date} 10:00-14:00")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Benchmark and round-trip check: WebReg schedule -> .ics.
+
+Compares the original ics-library implementation of
+convert_webreg_json_to_ics (Event objects + ContentLines, serialize(), then
+str.replace to splice in VTIMEZONE, one EXDATE line per skipped date
+recomputed for every meeting) with the streaming ICSWriter path
+(write_webreg_ics, with recess dates memoized per semester and weekday and
+emitted as one multi-valued EXDATE).
+
+Round-trip checks, on the saved WebReg fixture:
+  * both outputs contain the same VEVENT properties once lines are unfolded
+    (ignoring UID/DTSTAMP, and undoing the legacy TZID bug, which wrote the
+    parameter as "A,m,e,r,i,c,a,...");
+  * the streamed output parses back with the ics library to the expected
+    events, and every physical line fits in 75 octets.
+
+Usage:
+    python benchmarks/bench_ics_writer.py [courses] [repeats]
+"""
+import io
+import json
+import os
+import random
+import sys
+import tempfile
+import timeit
+from datetime import datetime, time, timedelta
+from zoneinfo import ZoneInfo
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from ics import Calendar, Event
+from ics.grammar.parse import ContentLine
+
+from scrapers import webreg
+from scrapers.academic_calendar import AcademicCalendar
+from scrapers.webreg import (
+    DAY_TO_WEEKDAY, parse_view_table_html, write_webreg_ics,
+    generate_vtimezone_block, minutes_to_time, next_weekday,
+)
+
+FIXTURES = os.path.join(ROOT, "scrapers", "fixtures")
+SEMESTER = {"start": "2025-01-21", "end": "2025-05-05",
+            "recesses": [{"name": "Spring Recess", "start": "2025-03-15", "end": "2025-03-23"}]}
+
+
+def legacy_ics(schedule_data, semester_info):
+    """convert_webreg_json_to_ics before the streaming writer (returns the text)."""
+    from_zone = ZoneInfo("America/New_York")
+    calendar = Calendar()
+    semester_start = datetime.strptime(semester_info["start"], "%Y-%m-%d").replace(tzinfo=from_zone)
+    semester_end = datetime.strptime(semester_info["end"], "%Y-%m-%d").replace(tzinfo=from_zone)
+    until_dt_local = datetime.combine(semester_end.date(), time(23, 59, 59)).replace(tzinfo=from_zone)
+    skip_ranges = [
+        (datetime.strptime(r["start"], "%Y-%m-%d").replace(tzinfo=from_zone),
+         datetime.strptime(r["end"], "%Y-%m-%d").replace(tzinfo=from_zone))
+        for r in semester_info.get("recesses", [])
+    ]
+    for course in schedule_data["courses"]:
+        for meeting in course["meeting_times"]:
+            weekday = DAY_TO_WEEKDAY[meeting["day"]]
+            start_minutes, end_minutes = meeting["range"]
+            start_time = minutes_to_time(start_minutes)
+            end_time = minutes_to_time(end_minutes)
+            first_date = next_weekday(semester_start, weekday)
+            start_dt = datetime.combine(first_date.date(), start_time).replace(tzinfo=from_zone)
+            end_dt = datetime.combine(first_date.date(), end_time).replace(tzinfo=from_zone)
+            e = Event()
+            e.name = f"{course['title']} ({course['course_number']})"
+            e.extra.append(ContentLine(name="DTSTART", params={"TZID": "America/New_York"},
+                                       value=start_dt.strftime("%Y%m%dT%H%M%S")))
+            e.extra.append(ContentLine(name="DTEND", params={"TZID": "America/New_York"},
+                                       value=end_dt.strftime("%Y%m%dT%H%M%S")))
+            e.location = f"{meeting['building']} ({meeting['campus']})" if meeting["building"] else meeting["campus"]
+            e.description = f"Section {course['section_number']} | Index {course['index']} | Credits: {course['credits']}"
+            e.extra.append(ContentLine(name="RRULE",
+                                       value=f"FREQ=WEEKLY;UNTIL={until_dt_local.strftime('%Y%m%dT%H%M%S')}"))
+            for skip_start, skip_end in skip_ranges:
+                d = next_weekday(skip_start, weekday)
+                while d <= skip_end:
+                    skip_time = datetime.combine(d.date(), start_time).replace(tzinfo=from_zone)
+                    e.extra.append(ContentLine(name="EXDATE", params={"TZID": "America/New_York"},
+                                               value=skip_time.strftime("%Y%m%dT%H%M%S")))
+                    d += timedelta(days=7)
+            calendar.events.add(e)
+    ical_body = calendar.serialize()
+    return ical_body.replace("BEGIN:VEVENT", f"{generate_vtimezone_block()}BEGIN:VEVENT", 1)
+
+
+def streamed_ics(schedule_data):
+    buffer = io.StringIO()
+    write_webreg_ics(schedule_data, buffer)
+    return buffer.getvalue()
+
+
+def unfold(text):
+    lines = []
+    for line in text.replace("\r\n", "\n").split("\n"):
+        if line.startswith(" ") and lines:
+            lines[-1] += line[1:]
+        elif line:
+            lines.append(line)
+    return lines
+
+
+def event_properties(text):
+    """
+    Sorted VEVENT property sets, minus UID/DTSTAMP, with the legacy TZID bug
+    undone and multi-valued EXDATEs split into one line per date.
+    """
+    events, current = [], None
+    for line in unfold(text):
+        if line == "BEGIN:VEVENT":
+            current = []
+        elif line == "END:VEVENT":
+            events.append(tuple(sorted(current)))
+            current = None
+        elif current is not None and not line.startswith(("UID", "DTSTAMP")):
+            line = line.replace("TZID=A,m,e,r,i,c,a,/,N,e,w,_,Y,o,r,k", "TZID=America/New_York")
+            if line.startswith("EXDATE"):
+                head, values = line.split(":", 1)
+                current.extend(f"{head}:{value}" for value in values.split(","))
+            else:
+                current.append(line)
+    return sorted(events)
+
+
+def random_schedule(n, seed=0):
+    rng = random.Random(seed)
+    courses = []
+    for i in range(n):
+        start = rng.randrange(8 * 60, 20 * 60, 5)
+        days = rng.sample(list(DAY_TO_WEEKDAY)[:5], rng.choice([1, 2, 3]))
+        courses.append({
+            "title": f"SPECIAL TOPICS IN COMPUTATIONAL EVERYTHING, PART {i}",
+            "course_number": f"01:198:{100 + i % 900:03d}",
+            "section_number": f"{i % 20 + 1:02d}",
+            "index": f"{10000 + i}",
+            "credits": 3.0,
+            "meeting_times": [{"day": d, "range": [start, start + 80], "building": "HLL-114", "campus": "BUSCH"}
+                              for d in days]
+        })
+    return {"semester": "Spring 2025", "courses": courses}
+
+
+def check_round_trip(schedule):
+    legacy = legacy_ics(schedule, SEMESTER)
+    streamed = streamed_ics(schedule)
+    assert event_properties(legacy) == event_properties(streamed), "VEVENT properties differ"
+    assert all(len(line.encode()) <= 75 for line in streamed.split("\r\n")), "unfolded line over 75 octets"
+    assert "\n" not in streamed.replace("\r\n", ""), "bare LF in output"
+
+    parsed = Calendar(streamed)
+    meetings = sum(len(c["meeting_times"]) for c in schedule["courses"])
+    assert len(parsed.events) == meetings, "event count differs after parsing"
+    return meetings
+
+
+if __name__ == "__main__":
+    n_courses = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # Stand-in academic calendar so the benchmark runs without scraping
+    calendar_path = os.path.join(tempfile.mkdtemp(), "academic_calendar.json")
+    with open(calendar_path, "w") as f:
+        json.dump({"Spring 2025": SEMESTER}, f)
+    webreg.academic_calendar = AcademicCalendar(calendar_path)
+
+    with open(os.path.join(FIXTURES, "webreg_view_schedule.html")) as f:
+        semester, courses = parse_view_table_html(f.read())
+    fixture = {"semester": semester, "courses": courses}
+    print(f"round trip (fixture): {check_round_trip(fixture)} events OK")
+
+    big = random_schedule(n_courses)
+    print(f"round trip ({n_courses} courses): {check_round_trip(big)} events OK")
+
+    legacy_s = min(timeit.repeat(lambda: legacy_ics(big, SEMESTER), number=1, repeat=repeats))
+    streamed_s = min(timeit.repeat(lambda: streamed_ics(big), number=1, repeat=repeats))
+    print(f"{n_courses} courses: ics library {legacy_s * 1000:8.1f} ms | "
+          f"ICSWriter {streamed_s * 1000:6.1f} ms | {legacy_s / streamed_s:5.1f}x")
+    legacy_kb, streamed_kb = len(legacy_ics(big, SEMESTER)) / 1024, len(streamed_ics(big)) / 1024
+    print(f"{n_courses} courses: {legacy_kb:8.1f} KiB -> {streamed_kb:6.1f} KiB")
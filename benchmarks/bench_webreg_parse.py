@@ -0,0 +1,73 @@
+"""
+Benchmark: extracting WebReg course tables.
+
+Parses the saved WebReg pages in scrapers/fixtures/ with the one-shot HTML
+parsers (page_source + BeautifulSoup). When headless Chrome is available it
+also loads each fixture over file:// and compares the per-element WebDriver
+path against driver.page_source + the HTML parser, which is what a live
+scrape pays for.
+
+Usage:
+    python benchmarks/bench_webreg_parse.py [repeats]
+"""
+import os
+import sys
+import timeit
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from scrapers.webreg import (
+    HTML_PARSER,
+    parse_view_table_html,
+    parse_register_table_html,
+    view_table_courses_webdriver,
+    register_table_courses_webdriver,
+)
+
+FIXTURES = os.path.join(ROOT, "scrapers", "fixtures")
+PAGES = [
+    ("view table", "webreg_view_schedule.html",
+     lambda html: parse_view_table_html(html)[1], view_table_courses_webdriver),
+    ("register table", "webreg_register.html",
+     parse_register_table_html, register_table_courses_webdriver),
+]
+
+
+def bench_offline(repeats):
+    print(f"HTML parser: {HTML_PARSER}")
+    for name, filename, parse, _ in PAGES:
+        with open(os.path.join(FIXTURES, filename)) as f:
+            html = f.read()
+        courses = parse(html)
+        seconds = min(timeit.repeat(lambda: parse(html), number=1, repeat=repeats))
+        print(f"{name:>15}: {len(courses)} courses parsed in {seconds * 1000:.2f} ms")
+
+
+def bench_browser(repeats):
+    try:
+        from scrapers.driver_pool import new_chrome_driver
+        driver = new_chrome_driver()
+    except Exception as e:
+        print(f"\nSkipping WebDriver comparison (no headless Chrome: {e.__class__.__name__})")
+        return
+
+    try:
+        print()
+        for name, filename, parse, walk in PAGES:
+            driver.get("file://" + os.path.join(FIXTURES, filename))
+            walked, parsed = walk(driver), parse(driver.page_source)
+            assert walked == parsed, f"{name}: WebDriver and HTML parsers disagree"
+
+            webdriver_s = min(timeit.repeat(lambda: walk(driver), number=1, repeat=repeats))
+            html_s = min(timeit.repeat(lambda: parse(driver.page_source), number=1, repeat=repeats))
+            print(f"{name:>15}: webdriver {webdriver_s * 1000:8.1f} ms | "
+                  f"page_source+parse {html_s * 1000:6.1f} ms | {webdriver_s / html_s:5.1f}x")
+    finally:
+        driver.quit()
+
+
+if __name__ == "__main__":
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    bench_offline(repeats)
+    bench_browser(repeats)
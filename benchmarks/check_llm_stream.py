@@ -0,0 +1,113 @@
+"""
+Check: /update_schedule_with_prompt_stream end to end with FakeModel.
+
+Drives the SSE endpoint through Flask's test client with FakeModel streaming
+its answer in chunks, and asserts the event sequence and framing:
+
+    cache miss       -> token x N, schedule   (tokens join to the model's JSON)
+    same prompt      -> token x 1, schedule   (answered by the prompt cache)
+    model fails      -> token..., error       (nothing merged or logged)
+    merge fails      -> token..., error       (route turns it into an event)
+    missing prompt   -> 400
+
+MongoDB writes (merge_schedule, update_prompt_history) are replaced with
+recorders, so nothing outside this process is touched.
+
+Usage:
+    python benchmarks/check_llm_stream.py
+"""
+import json
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+import app as backend
+import llm_handler
+from fake_model import FakeModel
+from llm_cache import PromptCache
+
+
+class FailingModel(FakeModel):
+    """Streams one chunk, then fails the way a dropped Gemini stream does."""
+
+    def _stream(self, text, chunks=8):
+        yield from list(super()._stream(text, chunks))[:1]
+        raise RuntimeError("stream interrupted")
+
+
+def read_events(response):
+    """Splits an SSE body into (event, decoded data) pairs, checking the framing."""
+    assert response.mimetype == "text/event-stream"
+    assert response.headers["Cache-Control"] == "no-cache"
+    body = response.get_data(as_text=True)
+    assert body.endswith("\n\n")
+    events = []
+    for block in body[:-2].split("\n\n"):
+        event_line, data_line = block.split("\n")
+        assert event_line.startswith("event: ") and data_line.startswith("data: "), block
+        events.append((event_line[len("event: "):], json.loads(data_line[len("data: "):])))
+    return events
+
+
+def main():
+    merged, logged = [], []
+
+    def fake_merge(netid, entries):
+        merged.append((netid, entries))
+        return "BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n"
+
+    backend.ensure_indexes_once = lambda: None
+    llm_handler.merge_schedule = fake_merge
+    llm_handler.update_prompt_history = lambda netid, prompt, response: logged.append((netid, prompt, response))
+    llm_handler.prompt_cache = PromptCache(version="check")  # memory only
+    model = FakeModel(latency=0)
+    llm_handler.model = model
+
+    client = backend.app.test_client()
+
+    def stream(prompt):
+        return client.post('/update_schedule_with_prompt_stream', json={'netid': 'user1', 'prompt': prompt})
+
+    # Cache miss: tokens as the model produces them, then the merged schedule
+    events = read_events(stream("gym monday 7-8am"))
+    names = [name for name, _ in events]
+    assert names[-1] == "schedule" and set(names[:-1]) == {"token"} and len(names) > 2, names
+    assert "".join(data for name, data in events if name == "token") == json.dumps(model.entries)
+    assert events[-1][1] == "BEGIN:VCALENDAR\r\nEND:VCALENDAR\r\n"
+    assert merged == [("user1", model.entries)]
+    assert logged == [("user1", "gym monday 7-8am", json.dumps(model.entries))]
+    assert model.calls == 1
+
+    # Same prompt: one token with the cached answer, no model call
+    events = read_events(stream("Gym Monday 7-8am."))
+    assert [name for name, _ in events] == ["token", "schedule"]
+    assert json.loads(events[0][1]) == model.entries
+    assert model.calls == 1 and len(merged) == 2
+
+    # Model fails mid-stream: partial tokens, then an error; nothing merged or logged
+    llm_handler.model = FailingModel(latency=0)
+    events = read_events(stream("study tuesday 2-4pm"))
+    assert [name for name, _ in events] == ["token", "error"]
+    assert "stream interrupted" in events[-1][1]
+    assert len(merged) == 2 and len(logged) == 2
+
+    # Merge fails: the route's handler reports it as an error event
+    llm_handler.model = FakeModel(latency=0)
+
+    def broken_merge(netid, entries):
+        raise ValueError("merge exploded")
+
+    llm_handler.merge_schedule = broken_merge
+    events = read_events(stream("lab wednesday 9-11am"))
+    assert events[-1] == ("error", "merge exploded") and events[-2][0] == "token"
+
+    # Bad request never opens a stream
+    response = client.post('/update_schedule_with_prompt_stream', json={'netid': 'user1'})
+    assert response.status_code == 400 and response.mimetype == "application/json"
+
+    print("SSE stream: miss, cache hit, model error, merge error, bad request  OK")
+
+
+if __name__ == "__main__":
+    main()
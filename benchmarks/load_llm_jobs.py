@@ -0,0 +1,109 @@
+"""
+Load test: synchronous vs job-based /update_schedule_with_prompt.
+
+Serves the Flask app from a single-threaded WSGI server (one sync worker),
+swaps Gemini for FakeModel with artificial latency, and fires concurrent
+clients at each endpoint while probing /test. With the synchronous endpoint
+every request, including the probe, queues behind the LLM calls; with the
+job API the worker only accepts and polls.
+
+MongoDB writes are replaced with no-ops and job records are kept in memory,
+so only worker occupancy is measured, and every client sends a distinct
+prompt so the prompt cache never answers.
+
+Usage:
+    python benchmarks/load_llm_jobs.py [clients] [latency_seconds]
+"""
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'backend')))
+
+from werkzeug.serving import WSGIRequestHandler, make_server
+
+import app as backend
+import llm_handler
+from fake_model import FakeModel
+from jobs import JobQueue
+
+
+class QuietHandler(WSGIRequestHandler):
+    def log_request(self, *args, **kwargs):
+        pass
+
+
+def post(url, payload):
+    request = urllib.request.Request(
+        url, data=json.dumps(payload).encode(), headers={"Content-Type": "application/json"}
+    )
+    with urllib.request.urlopen(request) as response:
+        return json.load(response)
+
+
+def get(url):
+    with urllib.request.urlopen(url) as response:
+        return json.load(response)
+
+
+def run_sync(base, i):
+    post(f"{base}/update_schedule_with_prompt", {"netid": f"user{i}", "prompt": f"sync gym {i}"})
+
+
+def run_async(base, i):
+    job = post(f"{base}/update_schedule_with_prompt_async", {"netid": f"user{i}", "prompt": f"async gym {i}"})
+    while get(f"{base}/jobs/{job['job_id']}")["state"] not in ("done", "failed"):
+        time.sleep(0.05)
+
+
+def measure(base, fn, clients):
+    probe_latency = []
+    done = threading.Event()
+
+    def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            get(f"{base}/test")
+            probe_latency.append(time.perf_counter() - start)
+            time.sleep(0.1)
+
+    prober = threading.Thread(target=probe)
+    start = time.perf_counter()
+    prober.start()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda i: fn(base, i), range(clients)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    prober.join()
+    return elapsed, max(probe_latency)
+
+
+def main():
+    clients = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    latency = float(sys.argv[2]) if len(sys.argv) > 2 else 1.0
+
+    llm_handler.model = FakeModel(latency=latency)
+    llm_handler.update_prompt_history = lambda *args: None
+    llm_handler.merge_schedule = lambda netid, entries: ""
+    backend.ensure_indexes_once = lambda: None
+    backend.llm_jobs = JobQueue(max_workers=clients, max_pending=clients)  # in-memory records
+    backend.llm_jobs.register("update_schedule_from_prompt", llm_handler.update_schedule_from_prompt)
+
+    server = make_server("127.0.0.1", 0, backend.app, threaded=False, request_handler=QuietHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}"
+
+    for name, fn in [("synchronous", run_sync), ("job API", run_async)]:
+        elapsed, worst_probe = measure(base, fn, clients)
+        print(f"{name:>12}: {clients} prompts in {elapsed:6.2f}s, "
+              f"worst /test latency {worst_probe * 1000:8.1f} ms")
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,27 @@
 import requests
 from bs4 import BeautifulSoup
+import argparse
 import json
-from datetime import datetime
+import os
+import sys
+import threading
+import time
+from collections import namedtuple
+from datetime import date, datetime, timedelta, timezone
+
+if __name__ == "__main__" and not __package__:
+    # Run as `python scrapers/academic_calendar.py`: make the `scrapers` package importable
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapers.parsing import HTML_PARSER
+
+# Single location for the calendar, regardless of the working directory
+ACADEMIC_CALENDAR_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "academic_calendar.json")
+
+ACADEMIC_CALENDAR_URL = "https://scheduling.rutgers.edu/scheduling/academic-calendar"
+
+Recess = namedtuple("Recess", "name start end")
+SemesterDates = namedtuple("SemesterDates", "name start end recesses")
 
 def parse_date(date_str):
     """Parse a date string like 'Tue, September 3, 2024' into 'YYYY-MM-DD' format."""
@@ -17,24 +37,51 @@ def parse_recess(recess_str):
     start_date = datetime.strptime(f"{start_str}, {end_date.year}", "%a, %B %d, %Y")
     return start_date.strftime("%Y-%m-%d"), end_date.strftime("%Y-%m-%d")
 
-def process_semester(rows, academic_years, i, semester_key, start_key, end_key, recess_info=None):
-    """Helper to process a semester's data from table rows."""
+def index_rows(rows):
+    """
+    Indexes the calendar table once by row label.
+
+    Returns:
+        dict: label (the <strong> text of the first cell) -> list of
+        (row position, [stripped cell texts]) in table order, so labels that
+        repeat (e.g. "Regular Classes End") keep every occurrence.
+    """
+    index = {}
+    for position, row in enumerate(rows):
+        cells = row.find_all("td")
+        strong = cells[0].find("strong") if cells else None
+        if strong is None:
+            continue
+        index.setdefault(strong.get_text().strip(), []).append(
+            (position, [cell.get_text().strip() for cell in cells])
+        )
+    return index
+
+def _first_row(index, label, semester_key, after=-1):
+    """First row labelled `label` below position `after`."""
+    for position, cells in index.get(label, ()):
+        if position > after:
+            return position, cells
+    raise ValueError(f"No '{label}' row found for {semester_key}")
+
+def _cell(cells, i):
+    return cells[i + 1] if i + 1 < len(cells) else ""
+
+def process_semester(index, academic_years, i, semester_key, start_key, end_key, recess_info=None):
+    """Helper to process a semester's data from the row index built by index_rows."""
     # Find the start row for the semester
-    start_row = next(r for r in rows if r.find("td").find("strong", string=start_key))
-    start_index = rows.index(start_row)
+    start_position, start_cells = _first_row(index, start_key, semester_key)
     
     # For semesters ending with "Regular Classes End", find the next occurrence after the start row
     if end_key == "Regular Classes End":
-        end_row = next((r for r in rows[start_index + 1:] if r.find("td").find("strong", string=end_key)), None)
-        if end_row is None:
-            raise ValueError(f"No 'Regular Classes End' row found after '{start_key}' for {semester_key}")
+        _, end_cells = _first_row(index, end_key, semester_key, after=start_position)
     else:
         # For other semesters (e.g., Winter, Summer), use the first matching row
-        end_row = next(r for r in rows if r.find("td").find("strong", string=end_key))
+        _, end_cells = _first_row(index, end_key, semester_key)
     
     # Extract start and end dates from the appropriate columns
-    start_str = start_row.find_all("td")[i + 1].text.strip()
-    end_str = end_row.find_all("td")[i + 1].text.strip()
+    start_str = _cell(start_cells, i)
+    end_str = _cell(end_cells, i)
     if not (start_str and end_str):
         return None
     
@@ -43,18 +90,18 @@ def process_semester(rows, academic_years, i, semester_key, start_key, end_key,
     
     # Handle Thanksgiving Recess for Fall semester
     if recess_info and recess_info["name"] == "Thanksgiving Recess":
-        recess_row = next(r for r in rows if r.find("td").find("strong", string=recess_info["name"]))
-        recess_str = recess_row.find_all("td")[i + 1].text.strip()
+        _, recess_cells = _first_row(index, recess_info["name"], semester_key)
+        recess_str = _cell(recess_cells, i)
         if recess_str:
             recess_start, recess_end = parse_recess(recess_str)
             data["recesses"].append({"name": recess_info["name"], "start": recess_start, "end": recess_end})
     
     # Handle Spring Recess for Spring semester
     elif recess_info and recess_info["name"] == "Spring Recess Begins":
-        recess_start_row = next(r for r in rows if r.find("td").find("strong", string="Spring Recess Begins"))
-        recess_end_row = next(r for r in rows if r.find("td").find("strong", string="Spring Recess Ends"))
-        recess_start_str = recess_start_row.find_all("td")[i + 1].text.strip()
-        recess_end_str = recess_end_row.find_all("td")[i + 1].text.strip()
+        _, recess_start_cells = _first_row(index, "Spring Recess Begins", semester_key)
+        _, recess_end_cells = _first_row(index, "Spring Recess Ends", semester_key)
+        recess_start_str = _cell(recess_start_cells, i)
+        recess_end_str = _cell(recess_end_cells, i)
         if recess_start_str and recess_end_str:
             data["recesses"].append({
                 "name": "Spring Recess",
@@ -64,18 +111,18 @@ def process_semester(rows, academic_years, i, semester_key, start_key, end_key,
     
     return data
 
-def scrape_academic_calendar(log=False):
-    url = "https://scheduling.rutgers.edu/scheduling/academic-calendar"
-    response = requests.get(url)
-    if response.status_code != 200:
-        raise Exception(f"Failed to load page: {response.status_code}")
-    
-    soup = BeautifulSoup(response.content, "html.parser")
+def parse_academic_calendar_html(html):
+    """
+    Parses the academic calendar page into
+    {"Fall 2025": {"start", "end", "recesses": [...]}, ...}.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
     table = soup.find("table", class_="pretty-table responsive-enabled")
     if not table:
         raise ValueError("Academic calendar table not found.")
     
-    rows = table.find("tbody").find_all("tr")
+    # Index the rows by label once; every semester lookup below is then O(1)
+    index = index_rows(table.find("tbody").find_all("tr"))
     academic_years = [th.text.strip() for th in table.find("thead").find("tr").find_all("th")[1:]]
     
     calendar_data = {}
@@ -91,16 +138,180 @@ def scrape_academic_calendar(log=False):
         for name_template, start_key, end_key, recess_info in semester_configs:
             year_to_use = fall_year if "Fall" in name_template else spring_year
             semester_key = name_template.format(year_to_use)
-            data = process_semester(rows, academic_years, i, semester_key, start_key, end_key, recess_info)
+            data = process_semester(index, academic_years, i, semester_key, start_key, end_key, recess_info)
             if data:
                 calendar_data[semester_key] = data
-    
-    with open("academic_calendar.json", "w") as f:
-        json.dump(calendar_data, f, indent=2)
-    if log: print("Data successfully written to academic_calendar.json")
+    return calendar_data
+
+def _write_json(path, data):
+    # Write to a temp file and swap it in, so readers never see a partial file
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+def _read_json(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+def scrape_academic_calendar(log=False, path=ACADEMIC_CALENDAR_PATH, url=ACADEMIC_CALENDAR_URL):
+    response = requests.get(url, timeout=30)
+    if response.status_code != 200:
+        raise Exception(f"Failed to load page: {response.status_code}")
+
+    calendar_data = parse_academic_calendar_html(response.content)
+    _write_json(path, calendar_data)
+    if log: print(f"Data successfully written to {path}")
+
+def refresh_academic_calendar(log=False, path=ACADEMIC_CALENDAR_PATH, url=ACADEMIC_CALENDAR_URL):
+    """
+    Conditionally re-scrapes the academic calendar.
+
+    The ETag and Last-Modified of the last fetch are kept in
+    {path}.meta.json and sent back as If-None-Match / If-Modified-Since, so
+    an unchanged page costs one 304 and no parsing. When the page did
+    change, it is parsed and the JSON is only rewritten if the parsed
+    calendar differs; the replaced calendar is kept as {path}.prev.
+
+    Args:
+        log: Boolean to enable/disable logging
+        path: Calendar JSON to refresh
+        url: Page to fetch (point it at a local stand-in server for testing)
+
+    Returns:
+        "not-modified" (304), "unchanged" (page changed, calendar did not),
+        or "updated"
+    """
+    meta_path = f"{path}.meta.json"
+    meta = _read_json(meta_path) or {}
+    current = _read_json(path)
+
+    headers = {}
+    if current is not None and meta.get("url") == url:
+        if meta.get("etag"): headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"): headers["If-Modified-Since"] = meta["last_modified"]
+
+    response = requests.get(url, headers=headers, timeout=30)
+    meta.update(url=url, checked_at=datetime.now(timezone.utc).isoformat())
+
+    if response.status_code == 304:
+        status = "not-modified"
+    elif response.status_code != 200:
+        raise Exception(f"Failed to load page: {response.status_code}")
+    else:
+        calendar_data = parse_academic_calendar_html(response.content)
+        if calendar_data == current:
+            status = "unchanged"
+        else:
+            if current is not None:
+                _write_json(f"{path}.prev", current)  # previous snapshot
+            _write_json(path, calendar_data)
+            status = "updated"
+        meta.update(etag=response.headers.get("ETag"), last_modified=response.headers.get("Last-Modified"))
+
+    _write_json(meta_path, meta)
+    if log: print(f"[calendar] {url}: {status}")
+    return status
+
+def refresh_academic_calendar_if_stale(max_age=timedelta(days=1), log=False, path=ACADEMIC_CALENDAR_PATH,
+                                       url=ACADEMIC_CALENDAR_URL):
+    """
+    Runs refresh_academic_calendar if the calendar is missing or was last
+    checked more than `max_age` ago. A failed check is logged, not raised,
+    as long as a calendar is already on disk.
+    """
+    meta = _read_json(f"{path}.meta.json") or {}
+    checked_at = meta.get("checked_at")
+    if os.path.exists(path) and checked_at and \
+            datetime.now(timezone.utc) - datetime.fromisoformat(checked_at) < max_age:
+        return "fresh"
+    try:
+        return refresh_academic_calendar(log=log, path=path, url=url)
+    except Exception as e:
+        if not os.path.exists(path):
+            raise
+        print(f"[calendar] Refresh failed, keeping the current calendar: {e}")
+        return "failed"
+
+class AcademicCalendar:
+    """
+    In-memory view of academic_calendar.json with dates already parsed.
+
+    The file is read and its dates converted to datetime.date once; later
+    lookups only stat the file and reload it if its mtime changed (e.g.
+    after scrape_academic_calendar rewrote it). One instance is shared by
+    every schedule conversion in the process.
+
+    Args:
+        path: JSON file written by scrape_academic_calendar.
+    """
+
+    def __init__(self, path=ACADEMIC_CALENDAR_PATH):
+        self.path = path
+        self._semesters = {}
+        self._mtime = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _parse(raw):
+        return {
+            name: SemesterDates(
+                name,
+                date.fromisoformat(info["start"]),
+                date.fromisoformat(info["end"]),
+                tuple(Recess(r["name"], date.fromisoformat(r["start"]), date.fromisoformat(r["end"]))
+                      for r in info.get("recesses", []))
+            )
+            for name, info in raw.items()
+        }
+
+    def _refresh(self):
+        mtime = os.stat(self.path).st_mtime_ns  # FileNotFoundError if never scraped
+        if mtime != self._mtime:
+            with self._lock:
+                if mtime != self._mtime:
+                    with open(self.path) as f:
+                        self._semesters = self._parse(json.load(f))
+                    self._mtime = mtime
+
+    def get(self, semester):
+        """Returns the SemesterDates for e.g. "Fall 2025", or None if unknown."""
+        self._refresh()
+        return self._semesters.get(semester)
+
+    def semesters(self):
+        self._refresh()
+        return dict(self._semesters)
+
+# Shared calendar for all conversions in this process
+academic_calendar = AcademicCalendar()
 
 def main():
-    scrape_academic_calendar(log=True)
+    parser = argparse.ArgumentParser(description="Scrape the Rutgers academic calendar.")
+    parser.add_argument("--url", default=ACADEMIC_CALENDAR_URL)
+    parser.add_argument("--path", default=ACADEMIC_CALENDAR_PATH)
+    parser.add_argument("--full", action="store_true",
+                        help="Always re-download and rewrite instead of a conditional refresh")
+    parser.add_argument("--every", type=float, default=0,
+                        help="Keep running, refreshing every N hours")
+    args = parser.parse_args()
+
+    if args.full:
+        scrape_academic_calendar(log=True, path=args.path, url=args.url)
+        return
+    while True:
+        try:
+            refresh_academic_calendar(log=True, path=args.path, url=args.url)
+        except Exception as e:
+            if not args.every:
+                raise
+            print(f"[calendar] Refresh failed: {e}")
+        if not args.every:
+            break
+        time.sleep(args.every * 3600)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,44 +3,18 @@ from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from urllib.parse import urlparse
+from bs4 import BeautifulSoup
 import time
 import os
 from dotenv import load_dotenv
 import json
 
-# Wait for all redirects to complete
-def wait_for_redirects_to_finish(driver, max_wait=30, check_interval=0.5):
-    # Store the initial URL
-    previous_url = driver.current_url
-    # Time elapsed
-    elapsed = 0
-    
-    while elapsed < max_wait:
-        # Wait for page to load
-        WebDriverWait(driver, 10).until(
-            lambda d: d.execute_script("return document.readyState") == "complete"
-        )
-        
-        # Get current URL after page load
-        current_url = driver.current_url
-        
-        # If URL hasn't changed, wait a bit and check again
-        if current_url == previous_url:
-            time.sleep(check_interval)
-            elapsed += check_interval
-            
-            # Check if URL is still the same after waiting
-            if driver.current_url == previous_url:
-                # If no change after waiting, assume redirects are done
-                return True
-        else:
-            # URL changed, update previous_url and reset elapsed time
-            previous_url = current_url
-            elapsed = 0
-            
-    # Timeout reached
-    return False
+from scrapers.driver_pool import get_default_pool
+from scrapers.session_pool import SessionExpired, fetch, get_default_session_pool
+from scrapers.parsing import HTML_PARSER
+from scrapers.timing import timings
 
 SERVICE = {
     'cas': 'https://cas.rutgers.edu',
@@ -49,6 +23,84 @@ SERVICE = {
     'my': 'https://cas.rutgers.edu/login?service=https://my.rutgers.edu/casShell/ngLogin'
 }
 
+# CAS ticket-granting cookie; without it no CAS session can exist
+CAS_SESSION_COOKIE = 'TGC'
+
+# Total time allowed for one interactive login, Duo push included (seconds)
+AUTH_TIMEOUT = 120
+
+# Map attribute textContent on CAS to attr names
+CAS_ATTRIBUTES = {
+    'cn': 'fullName',
+    'givenName': 'name',
+    'rutgersEduStudentLocation': 'campus',
+    'rutgersEduRUID': 'RUID',
+    'rutgersEduStudentUnit': 'unitName',
+    'rutgersEduStudentUnitCode': 'unitCode',
+    'uid': 'netid',
+    'mail': 'email'
+}
+
+# DOM markers for each page the login flow can land on, checked in order
+LOGIN_STATE_MARKERS = [
+    ('error', '#error-view-header-text'),           # Duo push denied or timed out
+    ('trust', '#trust-this-browser-label'),         # Duo push approved
+    ('duo', '#header-text'),                        # Duo prompt
+    ('login', '.accesskey, #username'),             # CAS login form
+    ('authenticated', '#attributesTable'),          # CAS landing page
+]
+
+def remaining(deadline, cap=None):
+    """Seconds left before `deadline` (a time.monotonic() value), optionally capped."""
+    left = max(deadline - time.monotonic(), 0.1)
+    return min(left, cap) if cap else left
+
+def detect_login_state(driver):
+    """
+    Classifies the page the driver is on right now, without waiting.
+
+    Returns:
+        One of the LOGIN_STATE_MARKERS names, 'authenticated' if the browser
+        was redirected off CAS to another service, or None while the page is
+        still loading or unrecognized.
+    """
+    if driver.execute_script("return document.readyState") != "complete":
+        return None
+    for state, selector in LOGIN_STATE_MARKERS:
+        if driver.find_elements(By.CSS_SELECTOR, selector):
+            return state
+    host = urlparse(driver.current_url).hostname
+    if host and host != urlparse(SERVICE['cas']).hostname and 'duosecurity' not in host:
+        return 'authenticated'
+    return None
+
+def wait_for_login_state(driver, states, timeout=30):
+    """
+    Blocks until the page reaches one of `states` (see detect_login_state).
+
+    Replaces the old fixed-interval redirect polling: WebDriverWait re-checks
+    the DOM as soon as the previous check returns, and gives up at `timeout`.
+
+    Returns:
+        The state reached, or None if the deadline passed first.
+    """
+    def reached(d):
+        state = detect_login_state(d)
+        return state if state in states else False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=0.1).until(reached)
+    except TimeoutException:
+        return None
+
+def has_session_cookie(driver):
+    """Checks every cookie jar (not just the current page's) for the CAS TGC."""
+    try:
+        cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+    except Exception:
+        cookies = driver.get_cookies()
+    return any(cookie["name"] == CAS_SESSION_COOKIE for cookie in cookies)
+
 # Gets the user login from .env, if present
 def get_user_login():
     user_login = None
@@ -78,24 +130,27 @@ def write_user_cookies(username, cookies_dict):
         json.dump(cookies_dict, file, indent=2)
 
 # Checks if the driver is authenticated
-def is_authenticated(driver, log=False, website_url=SERVICE['cas']):
-    driver.get(website_url)  # reload the page to see if login was successful
-    try:
-        driver.find_element(By.CLASS_NAME, "accesskey").text
-        return False  # authentication failed; back to login page
-    except NoSuchElementException:
-        return True   # authentication succeeded
+def is_authenticated(driver, log=False, website_url=SERVICE['cas'], timeout=10):
+    # A browser without a CAS ticket cookie cannot be logged in; skip the page load
+    if not has_session_cookie(driver):
+        return False
+
+    with timings.phase("auth.probe", log=log):
+        driver.get(website_url)  # reload the page to see if login was successful
+        state = wait_for_login_state(driver, ('login', 'authenticated'), timeout=timeout)
+    return state != 'login'  # back on the login page means authentication failed
 
 # Given cookies, authenticates the user
 def can_authenticate_with_cookies(driver, username, log=False, website_url=SERVICE['cas']):
-    driver.delete_all_cookies()
-    driver.get(website_url)  # load the webpage
-
-    # Reads in the cookies and adds them to the browser
+    # Reads in the cookies; without them there is nothing to try
     cookies = read_user_cookies(username)
-    if cookies:
+    if not cookies:
+        return False  # no cookies.json file
+
+    with timings.phase("auth.cookies", log=log):
+        driver.delete_all_cookies()
+        driver.get(website_url)  # load the webpage so cookies can be set on its domain
         for cookie in cookies.values(): driver.add_cookie(cookie)
-    else: return False  # no cookies.json file
     
     if is_authenticated(driver, log, website_url):
         return cookies
@@ -103,18 +158,24 @@ def can_authenticate_with_cookies(driver, username, log=False, website_url=SERVI
         driver.delete_all_cookies()  # cookies are incorrect; delete them
         return False
 
-def authenticate_service(driver, user=None, username=None, log=False, website_url=SERVICE['cas']):
+def authenticate_service(driver, user=None, username=None, log=False, website_url=SERVICE['cas'],
+                         timeout=AUTH_TIMEOUT):
     """
     Authenticates the user into the Rutgers service given by the website_url.
     First, tries to authenticate with cookies, if they exist. If the cookies
     do not exist or are invalid, grabs the cookies and returns them.
+
+    Every wait is on an explicit page state (see LOGIN_STATE_MARKERS) and
+    shares one overall deadline, so a login returns as soon as the next page
+    is ready. Each step is timed under "auth.*" in scrapers.timing.timings.
     
     Args:
         driver: Selenium webdriver instance
         user: Dictionary containing username and password
         log: Boolean to enable/disable logging
         website_url: URL of the service to authenticate
-        
+        timeout: Seconds allowed for the whole interactive login
+
     Returns:
         driver, cookies if authentication succeeds; None, None if cookie-based
         authentication fails; False, None if login fails
@@ -132,82 +193,99 @@ def authenticate_service(driver, user=None, username=None, log=False, website_ur
                         f"username and password again for {username}.")
             return None, None
 
+    deadline = time.monotonic() + timeout
+
     # Navigate to the login page
-    driver.get(website_url)
-    if log: print("Authentication page accessed.")
+    with timings.phase("auth.login_page", log=log):
+        driver.get(website_url)
+        if log: print("Authentication page accessed.")
+
+        # Enter user login info
+        username_selector = '#username'
+        password_selector = '#password'
+        login_button_selector = '#fm1 > input.btn.btn-block.btn-submit'
+
+        WebDriverWait(driver, remaining(deadline, 10)).until(
+            EC.presence_of_element_located((By.CSS_SELECTOR, username_selector))
+        )
 
-    # Enter user login info
-    username_selector = '#username'
-    password_selector = '#password'
-    login_button_selector = '#fm1 > input.btn.btn-block.btn-submit'
-    
-    WebDriverWait(driver, 10).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, username_selector))
-    )
-    
     driver.find_element(By.CSS_SELECTOR, username_selector).send_keys(user['username'])
     driver.find_element(By.CSS_SELECTOR, password_selector).send_keys(user['password'])
-    driver.find_element(By.CSS_SELECTOR, login_button_selector).click()
-    
-    if log: print('Login information entered.')
+    login_button = driver.find_element(By.CSS_SELECTOR, login_button_selector)
+    login_button.click()
 
-    # TODO: HANDLE INCORRECT INPUT OF NETID.
-    # Assume login info is correct ... (for now)
+    if log: print('Login information entered.')
 
-    # Wait for redirects to complete
-    if not wait_for_redirects_to_finish(driver):
-        if log: print("Timeout waiting for redirects to complete")
-    
-    # Wait for the Duo header to appear
-    WebDriverWait(driver, 30).until(
-        EC.presence_of_element_located((By.CSS_SELECTOR, '#header-text'))
-    )
-    
-    header_text = driver.find_element(By.CSS_SELECTOR, '#header-text').text
-    # if log: print(f"HEADER TEXT: {header_text}")
-    
-    if 'Duo' in header_text:
-        if log: print("Duo Push notification sent!")
-    
-    # Wait for either success or failure selector
-    try:
-        # First check if trust browser element appears (success case)
-        WebDriverWait(driver, 60).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, '#trust-this-browser-label'))
+    # Wait for the login form to be replaced, then for the redirects to land
+    # on the Duo prompt (or straight on the service if Duo is remembered)
+    with timings.phase("auth.submit", log=log):
+        try:
+            WebDriverWait(driver, remaining(deadline, 10)).until(EC.staleness_of(login_button))
+        except TimeoutException:
+            pass  # still on the form; the state check below reports it
+        state = wait_for_login_state(
+            driver, ('duo', 'trust', 'error', 'login', 'authenticated'),
+            timeout=remaining(deadline, 30)
         )
-        
+
+    if state == 'login':
+        # TODO: HANDLE INCORRECT INPUT OF NETID.
+        print("Login rejected. Check the username and password.")
+        return False, None
+    if state is None:
+        print("Timeout waiting for redirects to complete.")
+        return False, None
+
+    if state == 'duo':
+        header_text = driver.find_element(By.CSS_SELECTOR, '#header-text').text
+        if 'Duo' in header_text:
+            if log: print("Duo Push notification sent!")
+
+        # Wait for either success or failure selector
+        with timings.phase("auth.duo_push", log=log):
+            state = wait_for_login_state(
+                driver, ('trust', 'error', 'authenticated'), timeout=remaining(deadline, 60)
+            )
+
+    if state == 'trust':
         if log: print('Duo Push approved. Loading main page.')
-        
-        # Click the trust browser button
-        trust_browser_button = WebDriverWait(driver, 10).until(
-            EC.element_to_be_clickable((By.CSS_SELECTOR, '#trust-browser-button'))
-        )
-        trust_browser_button.click()
-        
-        if log: print("Clicked the trust-browser button.")
-        
-        # Wait until the "Success!" label disappears
-        WebDriverWait(driver, 30).until(
-            EC.invisibility_of_element_located((By.CSS_SELECTOR, "#push-success-label"))
-        )
-        
-        if log: print("Service loaded!")
 
-        # Grab the TGC and JSESSIONID cookies and write them to cookies.json
-        cookies = driver.get_cookies()
-        cookies_dict = {cookie["name"]: cookie for cookie in cookies}
-        write_user_cookies(user['username'], cookies_dict)
-        
-        return driver, cookies
-        
-    except TimeoutException:
-        # Check if error view appeared
-        if driver.find_element(By.CSS_SELECTOR, '#error-view-header-text'):
+        with timings.phase("auth.trust_browser", log=log):
+            # Click the trust browser button
+            trust_browser_button = WebDriverWait(driver, remaining(deadline, 10)).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, '#trust-browser-button'))
+            )
+            trust_browser_button.click()
+
+            if log: print("Clicked the trust-browser button.")
+
+            # Wait until the browser is sent back to the service
+            state = wait_for_login_state(driver, ('authenticated', 'error'),
+                                         timeout=remaining(deadline, 30))
+
+    if state != 'authenticated':
+        if state == 'error':
             print("Duo Push failed. Login again.")
-            return False, None
         else:
             print("Unexpected error during authentication.")
-            return False, None
+        return False, None
+
+    if log: print("Service loaded!")
+
+    # Grab the TGC and JSESSIONID cookies and write them to cookies.json
+    cookies = driver.get_cookies()
+    cookies_dict = {cookie["name"]: cookie for cookie in cookies}
+    write_user_cookies(user['username'], cookies_dict)
+
+    return driver, cookies
+
+def check_profile_username(user_profile, username=None, log=False):
+    """Returns the profile, or None if it belongs to someone other than `username`."""
+    if username and username != user_profile.get('netid'):
+        if log: print(f"Provided username '{username}' does not match " +
+                      f"authenticated user {user_profile.get('netid')}.")
+        return None
+    return user_profile
 
 def get_user_cas_data(driver, username=None, log=False):
     """
@@ -222,18 +300,8 @@ def get_user_cas_data(driver, username=None, log=False):
         Dictionary containing user profile information
     """
 
-    # Map attribute textContent on CAS to attr names
-    attr_to_name = {
-        'cn': 'fullName',
-        'givenName': 'name',
-        'rutgersEduStudentLocation': 'campus',
-        'rutgersEduRUID': 'RUID',
-        'rutgersEduStudentUnit': 'unitName',
-        'rutgersEduStudentUnitCode': 'unitCode',
-        'uid': 'netid',
-        'mail': 'email'
-    }
-    
+    attr_to_name = CAS_ATTRIBUTES
+
     # Scrape CAS service main page to get key-value pairs for user profile
     selector = '#attributesTable > tbody > tr > td:nth-child(1) > code > kbd'
     elements = driver.find_elements(By.CSS_SELECTOR, selector)
@@ -255,19 +323,74 @@ def get_user_cas_data(driver, username=None, log=False):
             
         value = value_element.text[1:-1]  # Remove quotes
         user_profile[attr] = value
-    
-    # If the provided username does not match, return None
-    if username and username != user_profile['netid']:
-        if log: print(f"Provided username '{username}' does not match " +
-                      f"authenticated user {user_profile['netid']}.")
-        return None
-    
+
+    return check_profile_username(user_profile, username, log)
+
+def parse_cas_attributes_html(html):
+    """Reads the CAS attributes table from page HTML into a user profile dict."""
+    soup = BeautifulSoup(html, HTML_PARSER)
+    user_profile = {}
+    for row in soup.select('#attributesTable > tbody > tr'):
+        cells = [td.select_one('code > kbd') for td in row.find_all('td', recursive=False)[:2]]
+        if len(cells) < 2 or not all(cells):
+            continue
+        attr = CAS_ATTRIBUTES.get(cells[0].get_text().strip())
+        value = cells[1].get_text().strip()
+        if attr and value:
+            user_profile[attr] = value[1:-1]  # Remove quotes
     return user_profile
 
-def scrape(fn, username=None, log=False, website_url=SERVICE['cas'], **kwargs):
+def get_user_cas_data_http(session, username=None, log=False):
+    """
+    Same as get_user_cas_data, but fetches the CAS landing page with a
+    requests.Session built from stored cookies instead of a browser.
+
+    Raises:
+        SessionExpired: If the stored cookies no longer authenticate.
+    """
+    response = fetch(session, SERVICE['cas'])
+    user_profile = parse_cas_attributes_html(response.text)
+    if not user_profile:
+        raise SessionExpired("CAS attributes page did not list any attributes")
+    return check_profile_username(user_profile, username, log)
+
+def scrape_http(fn, username, log=False, sessions=None, **kwargs):
+    """
+    Runs an HTTP scraping function with the user's stored CAS cookies.
+
+    Args:
+        - fn (function): Must accept (session, username, log) plus kwargs.
+        - username (str): NetID whose cookies.json to use.
+        - sessions (SessionPool, optional): Defaults to the process-wide pool.
+
+    Raises:
+        SessionExpired: If there are no usable cookies or CAS rejects them.
+    """
+    sessions = sessions or get_default_session_pool()
+    session = sessions.get(username)
+    if session is None:
+        raise SessionExpired(f"No usable cookies for {username}")
+    try:
+        with timings.phase("http", log=log):
+            return fn(session, username=username, log=log, **kwargs)
+    except SessionExpired:
+        sessions.expire(username)
+        raise
+
+def scrape(fn, username=None, log=False, website_url=SERVICE['cas'], pool=None, http_fn=None, **kwargs):
     """
     Run a Selenium-based web scraping function within an authenticated Rutgers CAS session.
 
+    The WebDriver is checked out of a DriverPool instead of started per call,
+    so repeated scrapes (e.g. one per semester) reuse a warm browser and, for
+    the same user, its session cookies. Time spent acquiring the driver,
+    authenticating and scraping is recorded in scrapers.timing.timings under
+    "acquire", "auth" and "scrape".
+
+    If `http_fn` is given, it is tried first with a requests.Session built
+    from the user's stored cookies (see scrape_http); the browser is only
+    started when that session has expired and a Duo login is needed.
+
     Args:
         - fn (function): The scraping function to execute. Must accept (driver,
         username, log) plus any additional kwargs.
@@ -277,6 +400,10 @@ def scrape(fn, username=None, log=False, website_url=SERVICE['cas'], **kwargs):
         and scraping. Defaults to False.
         - website_url (str, optional): URL for CAS-protected page to check
         authentication. Defaults to CAS login URL.
+        - pool (DriverPool, optional): Pool to check the driver out of. Defaults
+        to the process-wide pool.
+        - http_fn (function, optional): Browserless equivalent of `fn`, taking a
+        requests.Session in place of the driver.
         - **kwargs: Arbitrary keyword arguments to pass to the scraping function `fn`.
 
     Returns:
@@ -290,33 +417,40 @@ def scrape(fn, username=None, log=False, website_url=SERVICE['cas'], **kwargs):
     # If username is not provided, get it from stored user login
     if not username:
         user_login = get_user_login()
+        if user_login:
+            username = user_login['username']
 
-    # Set up Chrome browser options
-    chrome_options = Options()
-    chrome_options.add_argument("--headless")              # Enables headless mode (no browser window)
-    chrome_options.add_argument("--window-size=1280,720")  # Sets window size to ensure full page loads
+    # Fast path: reuse the stored CAS cookies without a browser
+    if http_fn and username:
+        try:
+            return scrape_http(http_fn, username, log=log, **kwargs)
+        except Exception as e:  # expired cookies, or a page the HTTP path can't read
+            if log: print(f"[http] {e}; falling back to the browser.")
 
-    # Initialize Selenium WebDriver
-    driver = webdriver.Chrome(options=chrome_options)
+    # Check out a (possibly already warm) WebDriver
+    pool = pool or get_default_pool()
+    with timings.phase("acquire", log=log):
+        pooled = pool.acquire(username)
+    driver = pooled.driver
     output = None  # Placeholder for the function result
+    failed = True
 
     try:
-        # If no username provided, extract it from user_login
-        if user_login and not username:
-            username = user_login['username']
-
         # If not already logged in to CAS, perform authentication
-        if not is_authenticated(driver, website_url=website_url):
-            authenticated_driver, _ = authenticate_service(
-                driver, user=user_login, username=username, log=log
-            )
-            if authenticated_driver is False or authenticated_driver is None:
-                raise SystemExit  # Stop execution if authentication fails
+        with timings.phase("auth", log=log):
+            if not is_authenticated(driver, website_url=website_url):
+                authenticated_driver, _ = authenticate_service(
+                    driver, user=user_login, username=username, log=log
+                )
+                if authenticated_driver is False or authenticated_driver is None:
+                    raise SystemExit  # Stop execution if authentication fails
 
         # Call the scraping function with the prepared driver and credentials
-        output = fn(driver, username=username, log=log, **kwargs)
+        with timings.phase("scrape", log=log):
+            output = fn(driver, username=username, log=log, **kwargs)
+        failed = False
 
     finally:
-        # Always quit the browser, even if errors occur
-        driver.quit()
+        # Return the browser to the pool; drop it if anything went wrong
+        pool.release(pooled, discard=failed)
         return output
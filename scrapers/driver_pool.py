@@ -0,0 +1,146 @@
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options
+import atexit
+import os
+import queue
+import threading
+
+def new_chrome_driver():
+    """Starts a headless Chrome instance with the options scrape() has always used."""
+    chrome_options = Options()
+    chrome_options.add_argument("--headless")              # Enables headless mode (no browser window)
+    chrome_options.add_argument("--window-size=1280,720")  # Sets window size to ensure full page loads
+    return webdriver.Chrome(options=chrome_options)
+
+def clear_all_cookies(driver):
+    """Clears cookies for every domain (delete_all_cookies only covers the current one)."""
+    try:
+        driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+    except Exception:
+        driver.delete_all_cookies()
+
+class PooledDriver:
+    """A pooled WebDriver plus the bookkeeping the pool needs to recycle it."""
+
+    def __init__(self, driver):
+        self.driver = driver
+        self.uses = 0
+        self.username = None  # user whose session cookies the browser holds
+
+class DriverPool:
+    """
+    Pool of reusable Selenium WebDrivers.
+
+    Starting Chrome costs seconds, so drivers are kept alive between scrape()
+    calls. A driver is health-checked before it is handed out and replaced
+    after `max_uses` checkouts or whenever it fails. Each driver remembers
+    which user it last served: handing it to the same user keeps the CAS and
+    WebReg session cookies, handing it to someone else clears them first.
+
+    Args:
+        size: Maximum number of live drivers.
+        max_uses: Checkouts before a driver is quit and replaced.
+        factory: Callable returning a new WebDriver.
+    """
+
+    def __init__(self, size=2, max_uses=25, factory=new_chrome_driver):
+        self.size = size
+        self.max_uses = max_uses
+        self.factory = factory
+        self._idle = queue.LifoQueue()
+        self._live = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _healthy(self, pooled):
+        try:
+            pooled.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, pooled):
+        try:
+            pooled.driver.quit()
+        except Exception:
+            pass
+        with self._lock:
+            self._live -= 1
+
+    def acquire(self, username=None, timeout=None):
+        """
+        Checks out a driver for `username`, starting one if the pool has room
+        and otherwise waiting for one to be released.
+
+        Returns:
+            PooledDriver: Pass it back to release() when done.
+        """
+        if self._closed:
+            raise RuntimeError("DriverPool is closed")
+
+        while True:
+            # Prefer an idle driver that already holds this user's session
+            pooled = None
+            with self._lock:
+                idle = []
+                while not self._idle.empty():
+                    idle.append(self._idle.get_nowait())
+                for candidate in idle:
+                    if pooled is None and candidate.username == username:
+                        pooled = candidate
+                    else:
+                        self._idle.put(candidate)
+                if pooled is None and idle:
+                    pooled = self._idle.get_nowait()
+                if pooled is None and self._live < self.size:
+                    self._live += 1
+                    pooled = False  # start a new driver below, outside the lock
+
+            if pooled is False:
+                try:
+                    pooled = PooledDriver(self.factory())
+                except Exception:
+                    with self._lock:
+                        self._live -= 1
+                    raise
+            elif pooled is None:
+                pooled = self._idle.get(timeout=timeout)  # wait for a release
+
+            if pooled.uses >= self.max_uses or not self._healthy(pooled):
+                self._discard(pooled)
+                continue
+
+            if pooled.username != username:
+                if pooled.username is not None:
+                    clear_all_cookies(pooled.driver)
+                pooled.username = username
+            pooled.uses += 1
+            return pooled
+
+    def release(self, pooled, discard=False):
+        """Returns a driver to the pool; discard=True quits it instead (e.g. after an error)."""
+        if discard or self._closed:
+            self._discard(pooled)
+        else:
+            self._idle.put(pooled)
+
+    def close(self):
+        """Quits every idle driver and refuses further checkouts."""
+        self._closed = True
+        while not self._idle.empty():
+            self._discard(self._idle.get_nowait())
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_default_pool():
+    """Returns the process-wide pool, sized by SCRAPER_POOL_SIZE / SCRAPER_DRIVER_MAX_USES."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = DriverPool(
+                size=int(os.getenv("SCRAPER_POOL_SIZE", "2")),
+                max_uses=int(os.getenv("SCRAPER_DRIVER_MAX_USES", "25"))
+            )
+            atexit.register(_default_pool.close)
+        return _default_pool
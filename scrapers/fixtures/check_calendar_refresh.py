@@ -0,0 +1,81 @@
+"""
+Check: conditional academic-calendar refresh against the local stand-in server.
+
+Serves a copy of academic_calendar.html with serve_fixture.py on a free port
+and asserts the sequence of refresh_academic_calendar outcomes:
+
+    first fetch               -> updated       (calendar + meta written)
+    same page again           -> not-modified  (304 on If-None-Match)
+    cosmetic page edit        -> unchanged     (new ETag, same calendar)
+    a date on the page moves  -> updated       (.prev keeps the old calendar)
+    refresh_..._if_stale      -> fresh         (checked moments ago)
+
+Usage:
+    python scrapers/fixtures/check_calendar_refresh.py
+"""
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(os.path.dirname(FIXTURES)))
+
+from scrapers.academic_calendar import refresh_academic_calendar, refresh_academic_calendar_if_stale
+from scrapers.fixtures.serve_fixture import serve
+
+
+def edit(path, old, new):
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+    assert old in html, old
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(html.replace(old, new, 1))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        page = os.path.join(tmp, "academic_calendar.html")
+        shutil.copy(os.path.join(FIXTURES, "academic_calendar.html"), page)
+        path = os.path.join(tmp, "academic_calendar.json")
+
+        server = serve(page, port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{server.server_port}/"
+
+        def refresh():
+            return refresh_academic_calendar(path=path, url=url)
+
+        try:
+            assert refresh() == "updated"
+            with open(path) as f:
+                first = json.load(f)
+            with open(f"{path}.meta.json") as f:
+                meta = json.load(f)
+            assert first and meta["etag"] and meta["url"] == url
+
+            assert refresh() == "not-modified"
+
+            edit(page, "</body>", "<!-- cosmetic --></body>")
+            assert refresh() == "unchanged"
+            assert not os.path.exists(f"{path}.prev")
+
+            edit(page, "Wed, December 10, 2025", "Tue, December 9, 2025")
+            assert refresh() == "updated"
+            with open(f"{path}.prev") as f:
+                assert json.load(f) == first
+            with open(path) as f:
+                assert json.load(f) != first
+
+            assert refresh_academic_calendar_if_stale(path=path, url=url) == "fresh"
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    print("calendar refresh: updated -> not-modified -> unchanged -> updated -> fresh  OK")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""
+Local stand-in for a scraped page: serves one saved HTML fixture with an
+ETag and Last-Modified header, answering conditional requests with 304
+like the real server.
+
+Usage:
+    python scrapers/fixtures/serve_fixture.py [fixture.html] [--port 8765]
+    python -m scrapers.academic_calendar --url http://localhost:8765/ --path /tmp/academic_calendar.json
+
+Edit the fixture while the server runs to simulate the page changing.
+check_calendar_refresh.py runs that sequence automatically.
+"""
+import argparse
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FIXTURES = os.path.dirname(os.path.abspath(__file__))
+
+
+def make_handler(fixture_path):
+    class FixtureHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            with open(fixture_path, "rb") as f:
+                body = f.read()
+            mtime = int(os.path.getmtime(fixture_path))
+            etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+            last_modified = formatdate(mtime, usegmt=True)
+
+            not_modified = False
+            if self.headers.get("If-None-Match"):
+                not_modified = self.headers["If-None-Match"] == etag
+            elif self.headers.get("If-Modified-Since"):
+                try:
+                    since = parsedate_to_datetime(self.headers["If-Modified-Since"]).timestamp()
+                    not_modified = mtime <= since
+                except (TypeError, ValueError):
+                    pass
+
+            self.send_response(304 if not_modified else 200)
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", last_modified)
+            if not_modified:
+                self.end_headers()
+                return
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    return FixtureHandler
+
+
+def serve(fixture_path, port=8765):
+    """Builds the server; call .serve_forever() (or run it in a thread) to start it."""
+    return ThreadingHTTPServer(("127.0.0.1", port), make_handler(fixture_path))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixture", nargs="?", default=os.path.join(FIXTURES, "academic_calendar.html"))
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    server = serve(args.fixture, args.port)
+    print(f"Serving {args.fixture} on http://127.0.0.1:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
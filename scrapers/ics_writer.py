@@ -0,0 +1,90 @@
+from contextlib import contextmanager
+
+CRLF = "\r\n"
+MAX_LINE_OCTETS = 75  # RFC 5545 section 3.1, excluding the CRLF
+
+def escape_text(value):
+    """Escapes a TEXT value (RFC 5545 section 3.3.11): backslash, ';', ',' and newlines."""
+    return (str(value)
+            .replace("\\", "\\\\")
+            .replace(";", "\\;")
+            .replace(",", "\\,")
+            .replace("\r\n", "\\n")
+            .replace("\n", "\\n"))
+
+def fold(line):
+    """
+    Folds a content line into chunks of at most 75 octets, each continuation
+    starting with a single space. Never splits a UTF-8 character.
+    """
+    if len(line) <= MAX_LINE_OCTETS and line.isascii():
+        return line
+    chunks = []
+    current, size = [], 0
+    limit = MAX_LINE_OCTETS
+    for char in line:
+        width = len(char.encode("utf-8"))
+        if size + width > limit:
+            chunks.append("".join(current))
+            current, size = [], 0
+            limit = MAX_LINE_OCTETS - 1  # continuation lines spend one octet on the leading space
+        current.append(char)
+        size += width
+    chunks.append("".join(current))
+    return (CRLF + " ").join(chunks)
+
+def _param_value(value):
+    # Quote parameter values containing separators (section 3.2)
+    value = str(value)
+    return f'"{value}"' if any(c in value for c in ':;,') else value
+
+class ICSWriter:
+    """
+    Streaming RFC 5545 writer.
+
+    Writes content lines straight to `out` (any object with .write, e.g. an
+    open file or io.StringIO) as they are produced, with CRLF line endings
+    and 75-octet line folding, instead of building a calendar object model
+    and serializing it at the end.
+
+    Examples:
+        >>> writer = ICSWriter(buffer)
+        >>> with writer.component("VCALENDAR"):
+        ...     writer.line("VERSION", "2.0")
+        ...     with writer.component("VEVENT"):
+        ...         writer.line("SUMMARY", "Office hours", text=True)
+    """
+
+    def __init__(self, out):
+        self.out = out
+
+    def line(self, name, value, params=None, text=False):
+        """
+        Writes one property. `params` maps parameter names to a value or a
+        list of values; text=True escapes `value` as a TEXT value.
+        """
+        head = name
+        if params:
+            for key, values in params.items():
+                if not isinstance(values, (list, tuple)):
+                    values = [values]
+                head += f";{key}=" + ",".join(_param_value(v) for v in values)
+        self.out.write(fold(f"{head}:{escape_text(value) if text else value}") + CRLF)
+
+    def begin(self, name):
+        self.out.write(f"BEGIN:{name}{CRLF}")
+
+    def end(self, name):
+        self.out.write(f"END:{name}{CRLF}")
+
+    @contextmanager
+    def component(self, name):
+        self.begin(name)
+        yield self
+        self.end(name)
+
+    def raw(self, block):
+        """Writes pre-built content lines (e.g. a VTIMEZONE block), normalizing line endings."""
+        for line in block.splitlines():
+            if line:
+                self.out.write(line + CRLF)
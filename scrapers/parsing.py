@@ -0,0 +1,6 @@
+# Prefer the much faster lxml parser for BeautifulSoup when it is installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
@@ -0,0 +1,137 @@
+import json
+import os
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+CAS_HOST = "cas.rutgers.edu"
+
+# Plain desktop Chrome UA; some Rutgers pages reject the default python-requests one
+USER_AGENT = ("Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/124.0 Safari/537.36")
+
+class SessionExpired(Exception):
+    """The stored cookies no longer authenticate; an interactive login is needed."""
+
+def cookies_path(username):
+    return f"./.users/{username}/cookies.json"
+
+def new_http_session(cookies):
+    """
+    Builds a requests.Session carrying cookies saved from Selenium
+    (the {name: cookie dict} format of cookies.json).
+    """
+    session = requests.Session()
+    session.headers["User-Agent"] = USER_AGENT
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4, max_retries=1)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    for cookie in cookies.values():
+        session.cookies.set(
+            cookie["name"], cookie["value"],
+            domain=cookie.get("domain", CAS_HOST).lstrip("."),
+            path=cookie.get("path", "/"),
+            secure=cookie.get("secure", False),
+            expires=cookie.get("expiry")
+        )
+    return session
+
+def fetch(session, url, method="get", data=None, timeout=15):
+    """
+    Requests a CAS-protected page, following the CAS service-ticket redirects.
+
+    Returns:
+        requests.Response: The final response.
+
+    Raises:
+        SessionExpired: If CAS answered with its login form instead.
+    """
+    response = session.request(method, url, data=data, timeout=timeout, allow_redirects=True)
+    landed = urlparse(response.url)
+    if response.status_code in (401, 403) or (
+        landed.hostname == CAS_HOST and landed.path.startswith("/login")
+        and 'id="username"' in response.text
+    ):
+        raise SessionExpired(f"CAS session expired ({response.status_code} at {landed.hostname}{landed.path})")
+    response.raise_for_status()
+    return response
+
+class SessionPool:
+    """
+    Per-user pool of requests.Sessions built from ./.users/{username}/cookies.json.
+
+    A session keeps its connections alive across scrapes, so a scheduled
+    refresh costs a few HTTPS requests instead of a Chrome start-up. Sessions
+    are rebuilt whenever cookies.json changes (e.g. after a Selenium login),
+    and a user whose cookies have been found expired is not retried until the
+    file changes again.
+
+    Args:
+        maxsize: Most users to keep sessions for; the least recently used is
+            closed first.
+    """
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._sessions = OrderedDict()  # username -> (session, cookies.json mtime)
+        self._expired = {}              # username -> mtime of cookies known to be stale
+        self._lock = threading.Lock()
+
+    def get(self, username):
+        """Returns a session for `username`, or None if there are no usable cookies."""
+        path = cookies_path(username)
+        try:
+            mtime = os.path.getmtime(path)
+        except OSError:
+            return None
+
+        with self._lock:
+            if self._expired.get(username) == mtime:
+                return None
+            cached = self._sessions.get(username)
+            if cached and cached[1] == mtime:
+                self._sessions.move_to_end(username)
+                return cached[0]
+
+        with open(path) as f:
+            session = new_http_session(json.load(f))
+
+        with self._lock:
+            old = self._sessions.pop(username, None)
+            self._sessions[username] = (session, mtime)
+            while len(self._sessions) > self.maxsize:
+                _, (lru, _) = self._sessions.popitem(last=False)
+                lru.close()
+        if old:
+            old[0].close()
+        return session
+
+    def expire(self, username):
+        """Drops the user's session and ignores their cookies.json until it is rewritten."""
+        with self._lock:
+            cached = self._sessions.pop(username, None)
+            if cached:
+                self._expired[username] = cached[1]
+        if cached:
+            cached[0].close()
+
+    def close(self):
+        with self._lock:
+            sessions = [session for session, _ in self._sessions.values()]
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+_default_sessions = None
+_default_sessions_lock = threading.Lock()
+
+def get_default_session_pool():
+    """Returns the process-wide SessionPool, sized by SCRAPER_SESSION_POOL_SIZE."""
+    global _default_sessions
+    with _default_sessions_lock:
+        if _default_sessions is None:
+            _default_sessions = SessionPool(maxsize=int(os.getenv("SCRAPER_SESSION_POOL_SIZE", "32")))
+        return _default_sessions
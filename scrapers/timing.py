@@ -0,0 +1,97 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+class LatencyHistogram:
+    """
+    Fixed-bucket latency histogram.
+
+    Args:
+        buckets: Increasing bucket upper bounds in seconds; observations above
+            the last bound land in an overflow bucket.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds):
+        with self._lock:
+            self.counts[bisect_left(self.buckets, seconds)] += 1
+            self.count += 1
+            self.total += seconds
+            self.max = max(self.max, seconds)
+
+    def quantile(self, q):
+        """Returns the upper bound of the bucket holding the q-th quantile."""
+        with self._lock:
+            if not self.count:
+                return 0.0
+            target = q * self.count
+            seen = 0
+            for bound, n in zip(self.buckets + (self.max,), self.counts):
+                seen += n
+                if seen >= target:
+                    return min(bound, self.max)
+            return self.max
+
+    def summary(self):
+        return {
+            "count": self.count,
+            "mean": self.total / self.count if self.count else 0.0,
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "max": self.max,
+            "buckets": dict(zip([f"<={b}s" for b in self.buckets] + ["overflow"], self.counts))
+        }
+
+class PhaseTimer:
+    """
+    Collects one LatencyHistogram per named phase (e.g. "acquire", "auth",
+    "scrape").
+
+    Examples:
+        >>> with timings.phase("scrape"):
+        ...     output = fn(driver)
+        >>> timings.report()
+    """
+
+    def __init__(self):
+        self.histograms = {}
+        self._lock = threading.Lock()
+
+    def histogram(self, name):
+        with self._lock:
+            if name not in self.histograms:
+                self.histograms[name] = LatencyHistogram()
+            return self.histograms[name]
+
+    @contextmanager
+    def phase(self, name, log=False):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.histogram(name).observe(elapsed)
+            if log: print(f"[timing] {name}: {elapsed * 1000:.0f} ms")
+
+    def summary(self):
+        return {name: h.summary() for name, h in sorted(self.histograms.items())}
+
+    def report(self):
+        for name, s in self.summary().items():
+            print(f"{name:>12}: n={s['count']:<4} mean={s['mean'] * 1000:8.0f} ms  "
+                  f"p50<={s['p50'] * 1000:7.0f} ms  p95<={s['p95'] * 1000:7.0f} ms  "
+                  f"max={s['max'] * 1000:8.0f} ms")
+
+# Shared timer for all scraping phases in this process
+timings = PhaseTimer()
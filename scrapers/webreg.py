@@ -1,12 +1,21 @@
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
+import hashlib
 import json
 import re
-from ics import Calendar, Event
-from ics.grammar.parse import ContentLine
-from datetime import datetime, time, timedelta
-from zoneinfo import ZoneInfo
+from functools import lru_cache
+from bs4 import BeautifulSoup, NavigableString
+from datetime import datetime, time, timedelta, timezone
+from urllib.parse import urljoin
+
+from scrapers.academic_calendar import academic_calendar
+from scrapers.ics_writer import ICSWriter
+from scrapers.parsing import HTML_PARSER
+from scrapers.session_pool import fetch
+
+WEBREG_CHOOSE_SEMESTER_URL = "https://sims.rutgers.edu/webreg/chooseSemester.htm?login=cas"
+WEBREG_VIEW_SCHEDULE_URL = "https://sims.rutgers.edu/webreg/viewScheduleByCourse.htm"
 
 # Define semester code
 def semester_code(semester):
@@ -22,6 +31,139 @@ def time_to_minutes(t):
     dt = datetime.strptime(t, '%I:%M %p')
     return dt.hour * 60 + dt.minute
 
+def _text(element):
+    """Whitespace-normalized text of a BeautifulSoup element, like WebDriver's .text."""
+    return " ".join(element.get_text(" ").split()) if element else ""
+
+def _parse_time_range(time_str, title, log=False):
+    """Parses '10:20 AM - 11:40 AM' into (start, end) minutes, or None if malformed."""
+    if " - " not in time_str:
+        if log: print(f"[WARN] Malformed time string in {title}: '{time_str}'")
+        return None
+    start_str, end_str = time_str.split(" - ")
+    return time_to_minutes(start_str.strip()), time_to_minutes(end_str.strip())
+
+def _course_header_fields(text):
+    """Extracts course number, section and index from a header like '(01:198:461) Section 03 | [22508]'."""
+    number_match = re.search(r'\((\d{2}:\d{3}:\d{3})\)', text)
+    section_match = re.search(r'Section (\d+)', text)
+    index_match = re.search(r'\[(\d{5})\]', text)
+    return (
+        number_match.group(1) if number_match else '',
+        section_match.group(1) if section_match else '',
+        index_match.group(1) if index_match else ''
+    )
+
+def _page_semester(soup):
+    """Semester named in a WebReg page's <h2> (e.g. "Fall 2025"), or None if it is not one."""
+    semester_text = _text(soup.find("h2")).split("»")[-1].strip()
+    if not semester_text or not any(s in semester_text.split()[0] for s in ["Winter", "Spring", "Summer", "Fall"]):
+        return None
+    return semester_text
+
+def parse_view_table_html(html, log=False):
+    """
+    Parses the course list of viewScheduleByCourse.htm from page HTML.
+
+    Equivalent to view_table_courses_webdriver, but works on a single
+    page_source string instead of one WebDriver call per element, and can be
+    run offline against saved pages.
+
+    Returns:
+    - tuple: (semester text such as "Fall 2025", or None if the header is not
+      a valid semester; list of course dictionaries)
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    # Extract semester from page header and ensure that it is valid
+    semester_text = _page_semester(soup)
+    if semester_text is None:
+        return None, []
+
+    courses = []
+    for course_block in soup.select("div.list-course table tbody"):
+        th = course_block.find("tr").find("th")
+
+        # Course title is the text node before the <span>
+        first = th.contents[0] if th.contents else ""
+        title = first.strip() if isinstance(first, NavigableString) else ""
+        course_number, section_number, index = _course_header_fields(_text(th.find("span")))
+
+        meeting_times = []
+        text_blob = _text(course_block).lower()
+        if not ("asynchronous" in text_blob or "hours by arrangement" in text_blob):
+            for m in course_block.find_all("tr")[1:]:
+                tds = m.find_all("td")
+                if len(tds) != 4:
+                    continue
+                time_range = _parse_time_range(_text(tds[1]), title, log)
+                if time_range is None:
+                    continue
+                meeting_times.append({
+                    "day": _text(tds[0]),
+                    "range": time_range,
+                    "building": _text(tds[2].find("a")),
+                    "campus": _text(tds[3])
+                })
+
+        courses.append({
+            "title": title,
+            "course_number": course_number,
+            "section_number": section_number,
+            "index": index,
+            "credits": 0.0,  # TODO: Update if credits are available elsewhere on the page
+            "meeting_times": meeting_times
+        })
+
+    return semester_text, courses
+
+def parse_register_table_html(html, log=False):
+    """
+    Parses the course list of the WebReg registration page from page HTML.
+
+    Equivalent to register_table_courses_webdriver, but works on a single
+    page_source string and can be run offline against saved pages.
+
+    Returns:
+    - list: Course dictionaries.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+
+    courses = []
+    for course in soup.select("dl.courses"):
+        header = _text(course.find("dt"))
+        body = course.find("dd")
+
+        title_match = re.search(r'\b([A-Z].*?)\s+\(', header)
+        credit_match = re.search(r'Credits:\s*([\d.]+)', header)
+        title = title_match.group(1) if title_match else ''
+        course_number, section_number, index = _course_header_fields(header)
+
+        meeting_times = []
+        text_blob = _text(body).lower()
+        if body and not ("asynchronous" in text_blob or "hours by arrangement" in text_blob):
+            for m in body.select(".meeting2"):
+                time_range = _parse_time_range(_text(m.select_one(".timestring3")), title, log)
+                if time_range is None:
+                    continue
+                meeting_times.append({
+                    "day": _text(m.select_one(".dayname3")),
+                    "range": time_range,
+                    "building": _text(m.select_one(".buildingroom3")),
+                    "campus": _text(m.select_one(".campus3"))
+                })
+
+        courses.append({
+            "title": title,
+            "course_number": course_number,
+            "section_number": section_number,
+            "index": index,
+            "credits": float(credit_match.group(1)) if credit_match else 0.0,
+            "meeting_times": meeting_times
+        })
+
+    return courses
+
 def select_webreg_semester(driver, semester):
     """
     Selects the appropriate semester radio button in WebReg based on visible semester text.
@@ -47,40 +189,8 @@ def select_webreg_semester(driver, semester):
             return
     raise ValueError(f"Semester '{semester}' not found in the semester selection list.")
 
-def webreg_schedule_view_table(driver, username, semester="Fall 2025", log=False):
-    """
-    Scrapes a user's Rutgers WebReg schedule and saves it to a JSON file with semester metadata.
-
-    Parameters:
-    - driver: Selenium WebDriver instance.
-    - username (str): NetID username.
-    - semester (str): Semester to scrape (default: "Fall 2025").
-    - log (bool): If True, prints debug output.
-
-    Returns:
-    - dict: Schedule including courses and semester metadata.
-    """
-    # Navigate to semester selection page
-    driver.get("https://sims.rutgers.edu/webreg/chooseSemester.htm?login=cas")
-
-    # Select the specified semester
-    try:
-        select_webreg_semester(driver, semester)
-    except ValueError:
-        return None  # Exit if semester selection fails
-    driver.find_element(By.CLASS_NAME, "btn-submit").click()
-
-    # Wait until the <h2> element is present and visible
-    WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CSS_SELECTOR, "h2")))
-    driver.get("https://sims.rutgers.edu/webreg/viewScheduleByCourse.htm")
-
-    # Extract semester from page header and ensure that it is valid
-    h2_text = driver.find_element(By.CSS_SELECTOR, "h2").text.strip()
-    semester_text = h2_text.split("»")[-1].strip()  # e.g., "Fall 2025"
-    if not any(s in semester_text.split()[0] for s in ["Winter", "Spring", "Summer", "Fall"]):
-        if log: print (f"Semester '{semester}' no longer accessible.")  # something went wrong
-        return None
-
+def view_table_courses_webdriver(driver, log=False):
+    """Reads the course list on viewScheduleByCourse.htm element by element through WebDriver."""
     # Locate all course blocks within the new HTML structure
     course_blocks = driver.find_elements(By.CSS_SELECTOR, "div.list-course table tbody")
     courses = []
@@ -155,6 +265,52 @@ def webreg_schedule_view_table(driver, username, semester="Fall 2025", log=False
             "meeting_times": meeting_times
         })
 
+    return courses
+
+def webreg_schedule_view_table(driver, username, semester="Fall 2025", log=False, mode="html"):
+    """
+    Scrapes a user's Rutgers WebReg schedule and saves it to a JSON file with semester metadata.
+
+    Parameters:
+    - driver: Selenium WebDriver instance.
+    - username (str): NetID username.
+    - semester (str): Semester to scrape (default: "Fall 2025").
+    - log (bool): If True, prints debug output.
+    - mode (str): "html" parses page_source locally in one round trip;
+      "webdriver" reads each element through WebDriver.
+
+    Returns:
+    - dict: Schedule including courses and semester metadata.
+    """
+    # Navigate to semester selection page
+    driver.get(WEBREG_CHOOSE_SEMESTER_URL)
+
+    # Select the specified semester
+    try:
+        select_webreg_semester(driver, semester)
+    except ValueError:
+        return None  # Exit if semester selection fails
+    driver.find_element(By.CLASS_NAME, "btn-submit").click()
+
+    # Wait until the <h2> element is present and visible
+    WebDriverWait(driver, 10).until(EC.visibility_of_element_located((By.CSS_SELECTOR, "h2")))
+    driver.get(WEBREG_VIEW_SCHEDULE_URL)
+
+    if mode == "html":
+        # One round trip: pull the rendered page and parse it locally
+        semester_text, courses = parse_view_table_html(driver.page_source, log=log)
+        if semester_text is None:
+            if log: print (f"Semester '{semester}' no longer accessible.")  # something went wrong
+            return None
+    else:
+        # Extract semester from page header and ensure that it is valid
+        h2_text = driver.find_element(By.CSS_SELECTOR, "h2").text.strip()
+        semester_text = h2_text.split("»")[-1].strip()  # e.g., "Fall 2025"
+        if not any(s in semester_text.split()[0] for s in ["Winter", "Spring", "Summer", "Fall"]):
+            if log: print (f"Semester '{semester}' no longer accessible.")  # something went wrong
+            return None
+        courses = view_table_courses_webdriver(driver, log=log)
+
     # Construct schedule data
     schedule_data = {
         "semester": semester_text,
@@ -164,7 +320,7 @@ def webreg_schedule_view_table(driver, username, semester="Fall 2025", log=False
     return schedule_data
 
 def get_current_semester(driver, log=False):
-    driver.get("https://sims.rutgers.edu/webreg/chooseSemester.htm?login=cas")
+    driver.get(WEBREG_CHOOSE_SEMESTER_URL)
     driver.find_element(By.CLASS_NAME, "btn-submit").click()
     
     # Wait until the <h2> element is present and visible
@@ -174,18 +330,8 @@ def get_current_semester(driver, log=False):
     semester_text = h2_text.split("»")[-1].strip()  # e.g., "Fall 2025"
     return semester_text
 
-def webreg_schedule_register_table(driver, username, semester, log=False):
-    """
-    Scrapes a user's Rutgers WebReg schedule and saves it to a JSON file with semester metadata.
-
-    Parameters:
-    - driver: Selenium WebDriver instance.
-    - username (str): NetID username.
-    - log (bool): If True, prints debug output.
-
-    Returns:
-    - dict: Schedule including courses and semester metadata.
-    """
+def register_table_courses_webdriver(driver, log=False):
+    """Reads the course list on the registration page element by element through WebDriver."""
     # Locate all course blocks on the page
     course_blocks = driver.find_elements(By.CSS_SELECTOR, "dl.courses")
     courses = []
@@ -254,6 +400,27 @@ def webreg_schedule_register_table(driver, username, semester, log=False):
             "meeting_times": meeting_times
         })
 
+    return courses
+
+def webreg_schedule_register_table(driver, username, semester, log=False, mode="html"):
+    """
+    Scrapes a user's Rutgers WebReg schedule and saves it to a JSON file with semester metadata.
+
+    Parameters:
+    - driver: Selenium WebDriver instance.
+    - username (str): NetID username.
+    - log (bool): If True, prints debug output.
+    - mode (str): "html" parses page_source locally in one round trip;
+      "webdriver" reads each element through WebDriver.
+
+    Returns:
+    - dict: Schedule including courses and semester metadata.
+    """
+    if mode == "html":
+        courses = parse_register_table_html(driver.page_source, log=log)
+    else:
+        courses = register_table_courses_webdriver(driver, log=log)
+
     # Construct schedule data
     schedule_data = {
         "semester": semester,
@@ -262,6 +429,75 @@ def webreg_schedule_register_table(driver, username, semester, log=False):
 
     return schedule_data
 
+def save_webreg_schedule(username, semester, schedule_data, log=False):
+    """Writes a scraped schedule to ./.users/{username}/{code}_schedule.json."""
+    json_filename = f"./.users/{username}/{semester_code(semester)}_schedule.json"
+    with open(json_filename, "w") as f:
+        json.dump(schedule_data, f, indent=2)
+    if log: print(f"Saved schedule to {json_filename}.")
+
+def section_key(course):
+    """Short label for a section, e.g. '01:198:440 Sec 01 [09214] INTRO TO ARTIFICIAL INTELLIGENCE'."""
+    return (f"{course.get('course_number', '')} Sec {course.get('section_number', '')} "
+            f"[{course.get('index', '')}] {course.get('title', '')}").strip()
+
+def fingerprint_key(course):
+    """
+    Key a section is fingerprinted under: its index, or course and section
+    number when WebReg showed no index (as the ICS UID falls back to the
+    course number).
+    """
+    return course.get("index") or f"{course.get('course_number', '')}-{course.get('section_number', '')}"
+
+def schedule_fingerprint(schedule_data):
+    """
+    Hashes what a schedule's calendar depends on: each section's index and
+    its meeting days, time ranges and rooms. Order on the page is ignored.
+
+    Returns:
+    - dict: {"hash": sha256 hex digest of the whole semester,
+      "sections": {fingerprint_key: {"label": section_key, "hash": digest
+      of that section's meetings}}}, or None for a missing schedule.
+    """
+    if not schedule_data:
+        return None
+    sections = {}
+    for course in schedule_data.get("courses", []):
+        meetings = sorted(
+            [m["day"], m["range"][0], m["range"][1], m.get("building", ""), m.get("campus", "")]
+            for m in course.get("meeting_times", [])
+        )
+        key = fingerprint_key(course)
+        if key in sections:
+            # Still ambiguous (no index or numbers): number the duplicates in page order
+            key = f"{key}#{sum(1 for k in sections if k.split('#')[0] == key) + 1}"
+        sections[key] = {
+            "label": section_key(course),
+            "hash": hashlib.sha256(json.dumps(meetings, separators=(",", ":")).encode()).hexdigest()[:16]
+        }
+    canonical = sorted([index, section["hash"]] for index, section in sections.items())
+    digest = hashlib.sha256(json.dumps(canonical, separators=(",", ":")).encode()).hexdigest()
+    return {"hash": digest, "sections": sections}
+
+def diff_fingerprints(old, new):
+    """
+    Compares two schedule_fingerprint results.
+
+    Returns:
+    - dict: {"changed": bool, "added": [labels], "dropped": [labels],
+      "modified": [labels]}, where "modified" lists sections kept under the
+      same fingerprint_key whose meetings changed.
+    """
+    old_sections = (old or {}).get("sections", {})
+    new_sections = (new or {}).get("sections", {})
+    return {
+        "changed": (old or {}).get("hash") != (new or {}).get("hash"),
+        "added": [new_sections[i]["label"] for i in sorted(new_sections.keys() - old_sections.keys())],
+        "dropped": [old_sections[i]["label"] for i in sorted(old_sections.keys() - new_sections.keys())],
+        "modified": [new_sections[i]["label"] for i in sorted(new_sections.keys() & old_sections.keys())
+                     if new_sections[i]["hash"] != old_sections[i]["hash"]]
+    }
+
 def webreg_schedule(driver, username, semester="Fall 2025", log=False, save=False):
     semester_text = get_current_semester(driver, log=log)
     schedule_data = {}  # empty JSON object
@@ -272,14 +508,156 @@ def webreg_schedule(driver, username, semester="Fall 2025", log=False, save=Fals
     
     # Save to JSON file, if requested
     if save:
-        json_filename = f"./.users/{username}/{semester_code(semester)}_schedule.json"
-        with open(json_filename, "w") as f:
-            json.dump(schedule_data, f, indent=2)
-        if log: print(f"Saved schedule to {json_filename}.")
+        save_webreg_schedule(username, semester, schedule_data, log=log)
     
     return schedule_data
 
+def webreg_schedules(driver, username, semesters, log=False, save=False):
+    """
+    Scrapes several semesters' WebReg schedules in one authenticated session.
+
+    The current term is detected once; its schedule is read straight from
+    the registration page that detection lands on, and every other semester
+    is read from its view-schedule page.
+
+    Parameters:
+    - driver: Selenium WebDriver instance (already authenticated).
+    - username (str): NetID username.
+    - semesters (list): Semesters to scrape, e.g. ["Spring 2025", "Fall 2025"].
+    - log (bool): If True, prints debug output.
+    - save (bool): If True, saves each schedule to its JSON file.
+
+    Returns:
+    - dict: Maps each requested semester to its schedule (None if unavailable).
+    """
+    current_semester = get_current_semester(driver, log=log)
+    schedules = {}
+
+    # Scrape the current term first, while the registration page is loaded
+    if current_semester in semesters:
+        schedules[current_semester] = webreg_schedule_register_table(driver, username, current_semester, log=log)
+
+    for semester in semesters:
+        if semester in schedules:
+            continue
+        if log: print(f"Scraping {semester} for {username}...")
+        try:
+            schedules[semester] = webreg_schedule_view_table(driver, username, semester, log=log)
+        except Exception as e:  # one bad semester shouldn't lose the others
+            if log: print(f"[WARN] Failed to scrape {semester}: {e}")
+            schedules[semester] = None
+
+    if save:
+        for semester in semesters:
+            save_webreg_schedule(username, semester, schedules[semester], log=log)
+
+    return {semester: schedules[semester] for semester in semesters}
+
+
+def semester_form_request(html, base_url, semester=None):
+    """
+    Builds the request a browser would send when submitting the
+    chooseSemester.htm form.
+
+    Parameters:
+    - html (str): The chooseSemester.htm page.
+    - base_url (str): URL the page was served from (to resolve the form action).
+    - semester (str, optional): Semester radio to select; None keeps the
+      page's default (the current term), like get_current_semester.
+
+    Returns:
+    - tuple: (method, action URL, form data)
 
+    Raises:
+    - ValueError: If the form or the semester is not on the page.
+    """
+    soup = BeautifulSoup(html, HTML_PARSER)
+    choose = soup.select_one("ul.choose")
+    form = choose.find_parent("form") if choose else soup.find("form")
+    if form is None:
+        raise ValueError("Semester selection form not found.")
+
+    data = {}
+    for input_element in form.find_all("input"):
+        name = input_element.get("name")
+        kind = (input_element.get("type") or "text").lower()
+        if not name or kind in ("radio", "checkbox", "button", "image", "reset"):
+            continue
+        if kind == "submit" and "btn-submit" not in (input_element.get("class") or []):
+            continue
+        data[name] = input_element.get("value", "")
+
+    target = semester.strip().lower() if semester else None
+    for li in form.select("ul.choose li"):
+        radio = li.find("input")
+        if radio is None or not radio.get("name"):
+            continue
+        if (target and _text(li).lower() == target) or (not target and radio.has_attr("checked")):
+            data[radio["name"]] = radio.get("value", "on")
+            break
+    else:
+        if target:
+            raise ValueError(f"Semester '{semester}' not found in the semester selection list.")
+
+    action = urljoin(base_url, form.get("action") or base_url)
+    return (form.get("method") or "get").lower(), action, data
+
+def webreg_schedules_http(session, username, semesters, log=False, save=False):
+    """
+    Browserless webreg_schedules: scrapes the same pages with a
+    requests.Session holding the user's CAS cookies and parses them with
+    parse_register_table_html / parse_view_table_html.
+
+    Parameters:
+    - session (requests.Session): Session from scrapers.session_pool.
+    - username (str): NetID username.
+    - semesters (list): Semesters to scrape, e.g. ["Spring 2025", "Fall 2025"].
+    - log (bool): If True, prints debug output.
+    - save (bool): If True, saves each schedule to its JSON file.
+
+    Returns:
+    - dict: Maps each requested semester to its schedule (None if unavailable).
+
+    Raises:
+    - SessionExpired: If CAS no longer accepts the session.
+    """
+    # Submitting the form unchanged lands on the current term's registration page
+    choose_page = fetch(session, WEBREG_CHOOSE_SEMESTER_URL)
+    method, action, data = semester_form_request(choose_page.text, choose_page.url)
+    register_page = fetch(session, action, method=method, data=data)
+    current_semester = _page_semester(BeautifulSoup(register_page.text, HTML_PARSER))
+    schedules = {}
+
+    if current_semester in semesters:
+        schedules[current_semester] = {
+            "semester": current_semester,
+            "courses": parse_register_table_html(register_page.text, log=log)
+        }
+
+    for semester in semesters:
+        if semester in schedules:
+            continue
+        if log: print(f"Scraping {semester} for {username}...")
+        try:
+            method, action, data = semester_form_request(choose_page.text, choose_page.url, semester)
+            fetch(session, action, method=method, data=data)
+            semester_text, courses = parse_view_table_html(
+                fetch(session, WEBREG_VIEW_SCHEDULE_URL).text, log=log
+            )
+            if semester_text is None:
+                if log: print (f"Semester '{semester}' no longer accessible.")
+                schedules[semester] = None
+            else:
+                schedules[semester] = {"semester": semester_text, "courses": courses}
+        except ValueError as e:
+            if log: print(f"[WARN] Failed to scrape {semester}: {e}")
+            schedules[semester] = None
+
+    if save:
+        for semester in semesters:
+            save_webreg_schedule(username, semester, schedules[semester], log=log)
+
+    return {semester: schedules[semester] for semester in semesters}
 
 def minutes_to_time(minutes):
     """Converts minutes after midnight to a datetime.time object."""
@@ -290,6 +668,20 @@ def next_weekday(start_date, target_weekday):
     days_ahead = (target_weekday - start_date.weekday() + 7) % 7
     return start_date + timedelta(days=days_ahead)
 
+ICS_TZID = "America/New_York"
+ICS_PRODID = "-//RUPlanner//WebReg Schedule//EN"
+
+# Mapping of day strings to Python weekday integers
+DAY_TO_WEEKDAY = {
+    "Monday": 0,
+    "Tuesday": 1,
+    "Wednesday": 2,
+    "Thursday": 3,
+    "Friday": 4,
+    "Saturday": 5,
+    "Sunday": 6
+}
+
 def generate_vtimezone_block():
     """Generates a VTIMEZONE block for America/New_York to handle DST transitions."""
     return (
@@ -313,134 +705,178 @@ def generate_vtimezone_block():
         "END:VTIMEZONE\n"
     )
 
+@lru_cache(maxsize=256)
+def recess_dates(semester_info, weekday):
+    """
+    Dates on `weekday` (0 = Monday) that fall inside one of the semester's
+    recesses. Memoized per (semester, weekday): every course meeting on that
+    weekday shares the result.
+
+    Returns:
+        tuple: datetime.date objects in order.
+    """
+    dates = []
+    for recess in semester_info.recesses:
+        d = next_weekday(recess.start, weekday)
+        while d <= recess.end:
+            dates.append(d)
+            d += timedelta(days=7)
+    return tuple(dates)
+
+@lru_cache(maxsize=1024)
+def exdate_value(semester_info, weekday, start_minutes):
+    """Comma-separated local EXDATE values for a meeting, e.g. '20250317T102000,20250324T102000'."""
+    clock = minutes_to_time(start_minutes).strftime("T%H%M%S")
+    return ",".join(d.strftime("%Y%m%d") + clock for d in recess_dates(semester_info, weekday))
+
+def write_webreg_ics(schedule_data, out, log=False):
+    """
+    Streams a WebReg schedule as an iCalendar document to `out`.
+
+    Lines are written as they are produced by an ICSWriter (CRLF endings,
+    75-octet folding), straight from the course and meeting dicts, with one
+    weekly-recurring VEVENT per meeting anchored in America/New_York.
+
+    Args:
+        schedule_data (dict): WebReg schedule containing "semester" and "courses".
+        out: Writable text stream (open file, io.StringIO, ...).
+        log (bool): If True, prints debug output.
+
+    Returns:
+        int: Number of events written, or None (and nothing written) if the
+        semester is not in the academic calendar.
+    """
+    semester = schedule_data.get("semester")
+    semester_info = academic_calendar.get(semester)
+    if not semester_info:
+        if log: print (f"Semester '{semester}' not found in academic calendar.")
+        return None
+
+    # RRULE UNTIL is the last day of classes at 23:59:59 local time; since
+    # DTSTART carries a TZID, UNTIL is local too (no Z suffix)
+    until = datetime.combine(semester_info.end, time(23, 59, 59)).strftime("%Y%m%dT%H%M%S")
+    dtstamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    local = {"TZID": [ICS_TZID]}
+
+    writer = ICSWriter(out)
+    count = 0
+    with writer.component("VCALENDAR"):
+        writer.line("VERSION", "2.0")
+        writer.line("PRODID", ICS_PRODID)
+        writer.raw(generate_vtimezone_block())
+
+        for course in schedule_data["courses"]:
+            summary = f"{course['title']} ({course['course_number']})"
+            description = f"Section {course['section_number']} | Index {course['index']} | Credits: {course['credits']}"
+
+            for meeting in course["meeting_times"]:
+                weekday = DAY_TO_WEEKDAY[meeting["day"]]
+                start_minutes, end_minutes = meeting["range"]
+
+                # First class on/after the semester start that falls on this weekday
+                first_date = next_weekday(semester_info.start, weekday)
+
+                with writer.component("VEVENT"):
+                    writer.line("UID", f"{course['index'] or course['course_number']}-{weekday}-{start_minutes}@ruplanner")
+                    writer.line("DTSTAMP", dtstamp)
+                    writer.line("SUMMARY", summary, text=True)
+                    writer.line("DTSTART", datetime.combine(first_date, minutes_to_time(start_minutes)).strftime("%Y%m%dT%H%M%S"), local)
+                    writer.line("DTEND", datetime.combine(first_date, minutes_to_time(end_minutes)).strftime("%Y%m%dT%H%M%S"), local)
+                    writer.line("RRULE", f"FREQ=WEEKLY;UNTIL={until}")
+
+                    # Skip the dates of this weekday that fall inside a recess
+                    exdates = exdate_value(semester_info, weekday, start_minutes)
+                    if exdates:
+                        writer.line("EXDATE", exdates, local)
+
+                    location = f"{meeting['building']} ({meeting['campus']})" if meeting["building"] else meeting["campus"]
+                    writer.line("LOCATION", location, text=True)
+                    writer.line("DESCRIPTION", description, text=True)
+                count += 1
+
+    return count
+
 def convert_webreg_json_to_ics(schedule_data, ics_output_path, log=False):
     """
     Convert a Rutgers WebReg schedule JSON file into an iCalendar (.ics) file.
 
-    This function reads a JSON file containing course schedule data, generates
-    recurring events for each course meeting based on the semester start and end
-    dates from academic_calendar.json, and excludes dates within recess periods.
-    The resulting calendar is saved as an .ics file compatible with standard
-    calendar applications.
+    This function generates recurring events for each course meeting based on
+    the semester start and end dates from the academic calendar, and excludes
+    dates within recess periods. The calendar is streamed to the file by
+    write_webreg_ics and is compatible with standard calendar applications.
 
     Args:
         schedule_data (str): Input JSON object containing the WebReg schedule.
         ics_output_path (str): Path where the output .ics file will be saved.
 
     Raises:
-        FileNotFoundError: If the JSON file at json_path does not exist.
-        ValueError: If the semester specified in the JSON is not found in academic_calendar.json.
-        json.JSONDecodeError: If the JSON file is malformed.
+        FileNotFoundError: If the academic calendar has not been scraped yet.
 
     Examples:
         >>> convert_webreg_json_to_ics(schedule_data, "am3606_schedule.ics")
         .ics calendar saved to: am3606_schedule.ics
     """
-    from_zone = ZoneInfo("America/New_York")  # Use US Eastern Time for event times
-
-    # Mapping of day strings to Python weekday integers
-    DAY_TO_WEEKDAY = {
-        "Monday": 0,
-        "Tuesday": 1,
-        "Wednesday": 2,
-        "Thursday": 3,
-        "Friday": 4,
-        "Saturday": 5,
-        "Sunday": 6
-    }
-
     semester = schedule_data.get("semester")
-    calendar = Calendar()
-    courses = schedule_data["courses"]
-
-    # Load academic calendar data
-    with open("academic_calendar.json") as f:
-        ACADEMIC_CALENDAR = json.load(f)
-
-    # Get the start and end of the semester
-    semester_info = ACADEMIC_CALENDAR.get(semester)
-    if not semester_info:
+    if not academic_calendar.get(semester):
         if log: print (f"Semester '{semester}' not found in academic calendar.")
         return
 
-    # Set semester start and end as timezone-aware dates
-    semester_start = datetime.strptime(semester_info["start"], "%Y-%m-%d").replace(tzinfo=from_zone)
-    semester_end = datetime.strptime(semester_info["end"], "%Y-%m-%d").replace(tzinfo=from_zone)
+    # newline="" keeps the writer's CRLF line endings on every platform
+    with open(ics_output_path, "w", newline="") as f:
+        write_webreg_ics(schedule_data, f, log=log)
 
-    # Define the semester end time in local time (23:59:59 America/New_York)
-    # This ensures the RRULE UNTIL reflects the local end date, adjusting for DST
-    until_dt_local = datetime.combine(semester_end.date(), time(23, 59, 59)).replace(tzinfo=from_zone)
+    if log: print(f".ics calendar saved to: {ics_output_path}")
 
-    # Parse recesses as ranges of dates to exclude from recurring events
-    skip_ranges = [
-        (
-            datetime.strptime(r["start"], "%Y-%m-%d").replace(tzinfo=from_zone),
-            datetime.strptime(r["end"], "%Y-%m-%d").replace(tzinfo=from_zone)
-        )
-        for r in semester_info.get("recesses", [])
-    ]
+def convert_webreg_json_to_events(schedule_data, log=False):
+    """
+    Convert a Rutgers WebReg schedule JSON object into structured schedule events.
 
-    # Loop through each course and its meeting times
-    for course in courses:
+    Produces one weekly-recurring event per course meeting, in the canonical
+    event format stored in MongoDB (see backend/schedule_events.py), with the
+    semester's start/end dates and recess exclusions taken from
+    academic_calendar.json. Use convert_webreg_json_to_ics to render the same
+    schedule as an .ics file.
+
+    Args:
+        schedule_data (dict): WebReg schedule containing "semester" and "courses".
+        log (bool): If True, prints debug output.
+
+    Returns:
+        list: Event dictionaries, or None if the semester is not in the academic calendar.
+    """
+    DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+    semester = schedule_data.get("semester")
+
+    semester_info = academic_calendar.get(semester)
+    if not semester_info:
+        if log: print (f"Semester '{semester}' not found in academic calendar.")
+        return None
+
+    semester_start = semester_info.start
+
+    events = []
+    for course in schedule_data["courses"]:
         for meeting in course["meeting_times"]:
-            weekday = DAY_TO_WEEKDAY[meeting["day"]]
+            weekday = DAYS.index(meeting["day"])
             start_minutes, end_minutes = meeting["range"]
-            start_time = minutes_to_time(start_minutes)
-            end_time = minutes_to_time(end_minutes)
-
-            # Find the first valid date on/after semester_start that matches the weekday
-            first_date = next_weekday(semester_start, weekday)
-            
-            # Define start and end datetimes in local time with America/New_York timezone
-            start_dt = datetime.combine(first_date.date(), start_time).replace(tzinfo=from_zone)
-            end_dt = datetime.combine(first_date.date(), end_time).replace(tzinfo=from_zone)
-
-            # Create an event object for the first occurrence of the course
-            e = Event()
-            e.name = f"{course['title']} ({course['course_number']})"
-            # Explicitly set DTSTART and DTEND with TZID to ensure DST handling
-            # Format: DTSTART;TZID=America/New_York:20250122T121000
-            e.extra.append(ContentLine(
-                name="DTSTART",
-                params={"TZID": "America/New_York"},
-                value=start_dt.strftime("%Y%m%dT%H%M%S")
-            ))
-            e.extra.append(ContentLine(
-                name="DTEND",
-                params={"TZID": "America/New_York"},
-                value=end_dt.strftime("%Y%m%dT%H%M%S")
-            ))
-            e.location = f"{meeting['building']} ({meeting['campus']})" if meeting["building"] else meeting["campus"]
-            e.description = f"Section {course['section_number']} | Index {course['index']} | Credits: {course['credits']}"
-
-            # Add a weekly recurrence rule with UNTIL in local time, adjusted for DST
-            # Since DTSTART uses TZID, UNTIL is in local time without Z suffix
-            e.extra.append(ContentLine(
-                name="RRULE",
-                value=f"FREQ=WEEKLY;UNTIL={until_dt_local.strftime('%Y%m%dT%H%M%S')}"
-            ))
-
-            # Add EXDATEs to skip dates during semester recesses, in local time with TZID
-            for skip_start, skip_end in skip_ranges:
-                d = next_weekday(skip_start, weekday)
-                while d <= skip_end:
-                    skip_time = datetime.combine(d.date(), start_time).replace(tzinfo=from_zone)
-                    e.extra.append(ContentLine(
-                        name="EXDATE",
-                        params={"TZID": "America/New_York"},
-                        value=skip_time.strftime("%Y%m%dT%H%M%S")
-                    ))
-                    d += timedelta(days=7)
-
-            # Add the event to the calendar
-            calendar.events.add(e)
-
-    # Write calendar with VTIMEZONE prepended manually
-    ical_body = calendar.serialize()
-    vtimezone = generate_vtimezone_block()
-    ical_with_timezone = ical_body.replace("BEGIN:VEVENT", f"{vtimezone}BEGIN:VEVENT", 1)
-
-    with open(ics_output_path, "w") as f:
-        f.write(ical_with_timezone)
 
-    if log: print(f".ics calendar saved to: {ics_output_path}")
+            events.append({
+                "id": f"{course['index'] or course['course_number']}-{weekday}-{start_minutes}",
+                "title": f"{course['title']} ({course['course_number']})",
+                "day": meeting["day"],
+                "start": start_minutes,
+                "end": end_minutes,
+                "location": f"{meeting['building']} ({meeting['campus']})" if meeting["building"] else meeting["campus"],
+                "description": f"Section {course['section_number']} | Index {course['index']} | Credits: {course['credits']}",
+                "date": None,
+                "recurrence": {
+                    "freq": "WEEKLY",
+                    "starts": semester_start.isoformat(),
+                    "until": semester_info.end.isoformat(),
+                    "exdates": [d.isoformat() for d in recess_dates(semester_info, weekday)]
+                },
+                "source": "webreg"
+            })
+
+    return events